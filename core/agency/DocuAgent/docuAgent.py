@@ -1,7 +1,8 @@
 from agency_swarm import Agent
 from .tools.documentation_tools import (
     AnalyzeRepositoryTool,
-    GenerateDocumentationTool
+    GenerateDocumentationTool,
+    DocumentMonorepoTool
 )
 
 class DocuAgent(Agent):
@@ -14,7 +15,8 @@ class DocuAgent(Agent):
             instructions="instructions.md",
             tools=[
                 AnalyzeRepositoryTool,
-                GenerateDocumentationTool
+                GenerateDocumentationTool,
+                DocumentMonorepoTool
             ],
             model="gpt-4-1106-preview"
         )
\ No newline at end of file
@@ -1,34 +1,59 @@
+from agency_swarm import get_openai_client
 from agency_swarm.tools import BaseTool
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import contextvars
 import os
-from typing import Dict, Any, List, ClassVar, Set, Optional
+from typing import Dict, Any, List, ClassVar, Set, Optional, Tuple
 from pydantic import Field, BaseModel, validator
 from ...settings.settings import (
     DOCS_OUTPUT_DIR,
     IGNORE_DIRS,
     DOCS_INDEX_FILE,
     README_FILE,
-    FILES_DIR
+    FILES_DIR,
+    SHARD_SETTINGS,
+    IMPORT_GRAPH_SETTINGS,
+    FANOUT_SETTINGS,
+    AGENT_SETTINGS,
+    DEFAULT_MODEL
 )
+from ...sharding import detect_shards, document_shards
+from ...workspace import outside_workspace
+from .import_graph import get_import_graph
+from .large_files import needs_sampling, describe_large_file, render_descriptor
 
 class FileAnalysis(BaseModel):
     """Structure for analyzed file information"""
     path: str
     content: str
     size: int
+    descriptor: Optional[Dict[str, Any]] = None
+    fan_in: int = 0
+    centrality: float = 0.0
+    priority: float = 0.0
 
 class RepositoryAnalysis(BaseModel):
     """Complete repository analysis structure"""
     files: List[FileAnalysis]
     repo_path: str
+    entry_points: List[str] = []
+    most_imported: List[str] = []
+    most_central: List[str] = []
+    external_dependencies: Dict[str, List[str]] = {}
 
 class AnalyzeRepositoryTool(BaseTool):
     """Repository analyzer that leverages LLM capabilities for deep understanding"""
     name: ClassVar[str] = "analyze_repository"
     description: ClassVar[str] = """Analyze repository content using LLM capabilities for deep semantic understanding.
-    Reads and analyzes all files in the repository to inform documentation generation."""
+    Reads and analyzes all files in the repository to inform documentation generation.
+    Files are ordered by importance (entry points first, then import-graph centrality)."""
     
     repo_path: str = Field(description="Full path to the repository to analyze")
+    exclude_dirs: List[str] = Field(
+        description="Directories, relative to repo_path, to leave out (e.g. packages documented separately)",
+        default=[]
+    )
 
     def run(self) -> dict:
         try:
@@ -46,6 +71,9 @@ class AnalyzeRepositoryTool(BaseTool):
                     continue
                 if any(part in IGNORE_DIRS for part in rel_root.parts):
                     continue
+                if any(rel_root == Path(excluded) or Path(excluded) in rel_root.parents
+                       for excluded in self.exclude_dirs):
+                    continue
                 
                 for file in files:
                     file_path = Path(root) / file
@@ -57,20 +85,48 @@ class AnalyzeRepositoryTool(BaseTool):
                         if file_path.suffix in {'.pyc', '.pyo', '.pyd', '.so', '.dll', '.class'}:
                             continue
                             
+                        # Oversized, minified and generated files are sampled, not read
+                        size = file_path.stat().st_size
+                        if needs_sampling(file_path, size):
+                            descriptor = describe_large_file(file_path)
+                            analyzed_files.append(FileAnalysis(
+                                path=rel_path.as_posix(),
+                                content=render_descriptor(rel_path.as_posix(), descriptor),
+                                size=size,
+                                descriptor=descriptor
+                            ))
+                            continue
+
                         # Read the entire file
                         content = file_path.read_text(errors='ignore')
                         
                         analyzed_files.append(FileAnalysis(
-                            path=str(rel_path),
+                            path=rel_path.as_posix(),
                             content=content,
                             size=len(content)
                         ))
                     except Exception as e:
                         print(f"Error reading {file_path}: {str(e)}")
 
+            # Rank files by how central they are to the codebase
+            graph = get_import_graph(
+                repo_path,
+                {file.path: file.content for file in analyzed_files}
+            )
+            for file in analyzed_files:
+                file.fan_in = graph.fan_in.get(file.path, 0)
+                file.centrality = graph.centrality.get(file.path, 0.0)
+                file.priority = graph.priority(file.path)
+            analyzed_files.sort(key=lambda file: (-file.priority, file.path))
+
+            top_n = IMPORT_GRAPH_SETTINGS.get("top_n", 20)
             analysis = RepositoryAnalysis(
                 files=analyzed_files,
-                repo_path=str(repo_path)
+                repo_path=str(repo_path),
+                entry_points=graph.entry_points,
+                most_imported=graph.ranked_by_fan_in(top_n),
+                most_central=graph.ranked_by_centrality(top_n),
+                external_dependencies=graph.declared_dependencies
             )
 
             return {
@@ -91,21 +147,49 @@ class GenerateDocumentationTool(BaseTool):
         description="Optional feedback from ReviewAgent",
         default=None
     )
+    docs_dir: Optional[str] = Field(
+        description="Optional output directory for documentation, e.g. a monorepo shard's directory",
+        default=None
+    )
+    readme_path: Optional[str] = Field(
+        description="Optional path for the generated README.md (defaults to the repository root), "
+                    "e.g. inside a monorepo shard's docs directory so the package's own README is kept",
+        default=None
+    )
+    fan_out: bool = Field(
+        description="Generate one page per module concurrently, then assemble index.md and README.md. "
+                    "Use for large repositories.",
+        default=False
+    )
 
     def run(self) -> dict:
         try:
             repo_path = Path(self.repo_path)
-            docs_dir = repo_path / DOCS_OUTPUT_DIR
+            docs_dir = Path(self.docs_dir) if self.docs_dir else repo_path / DOCS_OUTPUT_DIR
+            readme_path = Path(self.readme_path) if self.readme_path else repo_path / README_FILE
+            workspace = outside_workspace(docs_dir) or outside_workspace(readme_path)
+            if workspace:
+                return {"success": False, "error": f"docs_dir and readme_path must be inside the job workspace {workspace}"}
             docs_dir.mkdir(parents=True, exist_ok=True)
 
             # Process repository analysis
             repo_analysis = RepositoryAnalysis(**self.analysis)
             
             # Generate documentation based on analysis and any feedback
-            generated_docs = self._generate_documentation(
-                repo_analysis,
-                self.review_feedback
-            )
+            failed_modules = {}
+            if self.fan_out:
+                # README.md links to the docs index relative to its own directory
+                index_link = Path(os.path.relpath(docs_dir / DOCS_INDEX_FILE, readme_path.parent)).as_posix()
+                generated_docs, failed_modules = self._generate_fan_out_documentation(
+                    repo_analysis,
+                    self.review_feedback,
+                    index_link
+                )
+            else:
+                generated_docs = self._generate_documentation(
+                    repo_analysis,
+                    self.review_feedback
+                )
             
             # Write documentation files
             written_files = []
@@ -113,7 +197,7 @@ class GenerateDocumentationTool(BaseTool):
                 try:
                     # Handle special files
                     if doc_path == "README.md":
-                        full_path = repo_path / README_FILE
+                        full_path = readme_path
                     elif doc_path == "index.md":
                         full_path = docs_dir / DOCS_INDEX_FILE
                     else:
@@ -121,14 +205,15 @@ class GenerateDocumentationTool(BaseTool):
                     
                     full_path.parent.mkdir(parents=True, exist_ok=True)
                     full_path.write_text(content)
-                    written_files.append(str(full_path.relative_to(repo_path)))
+                    written_files.append(os.path.relpath(full_path, repo_path))
                 except Exception as e:
                     print(f"Error writing {doc_path}: {str(e)}")
 
             return {
-                "success": True,
+                "success": not failed_modules,
                 "docs_dir": str(docs_dir),
-                "generated_files": written_files
+                "generated_files": written_files,
+                "failed_modules": failed_modules
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -138,8 +223,9 @@ class GenerateDocumentationTool(BaseTool):
         """Generate documentation based on analysis and feedback"""
         docs = {}
         
-        # Let LLM analyze files to determine what documentation is needed
-        for file in analysis.files:
+        # Let LLM analyze files to determine what documentation is needed,
+        # most important files first
+        for file in sorted(analysis.files, key=lambda file: -file.priority):
             # Process files to determine documentation needs
             # The LLM can look at file content, patterns, and structure
             # to decide what documentation to generate
@@ -150,4 +236,184 @@ class GenerateDocumentationTool(BaseTool):
             # Let LLM process feedback and adjust documentation
             pass  # LLM will implement feedback incorporation
 
-        return docs  # LLM will return actual generated documentation
\ No newline at end of file
+        return docs  # LLM will return actual generated documentation
+
+    def _partition_modules(self, analysis: RepositoryAnalysis) -> Dict[str, List[FileAnalysis]]:
+        """Group files into modules by their leading directories.
+
+        A module with more source than one page can take is split into its
+        subdirectories, recursively, so pages stay bounded and are generated
+        in parallel.
+        """
+        depth = FANOUT_SETTINGS.get("module_depth", 1)
+        grouped = {}
+        for file in analysis.files:
+            parts = Path(file.path).parts[:-1][:depth]
+            grouped.setdefault('/'.join(parts) or "root", []).append(file)
+
+        modules = {}
+        for name, files in grouped.items():
+            modules.update(self._split_module(name, files))
+        return modules
+
+    def _split_module(self, name: str, files: List[FileAnalysis]) -> Dict[str, List[FileAnalysis]]:
+        if sum(len(file.content) for file in files) <= FANOUT_SETTINGS.get("max_module_chars", 60000):
+            return {name: files}
+
+        level = 0 if name == "root" else len(Path(name).parts)
+        groups = {}
+        for file in files:
+            parts = Path(file.path).parts[:-1]
+            # Files directly inside the module's directory stay in the module
+            key = '/'.join(parts[:level + 1]) if len(parts) > level else name
+            groups.setdefault(key, []).append(file)
+        if list(groups) == [name]:
+            return {name: files}
+
+        modules = {}
+        for key, group in groups.items():
+            modules.update({key: group} if key == name else self._split_module(key, group))
+        return modules
+
+    def _complete(self, system: str, prompt: str) -> str:
+        response = get_openai_client().chat.completions.create(
+            model=AGENT_SETTINGS.get("model", DEFAULT_MODEL),
+            temperature=AGENT_SETTINGS.get("temperature", 0.3),
+            max_tokens=FANOUT_SETTINGS.get("max_tokens", 2000),
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt}
+            ]
+        )
+        return response.choices[0].message.content or ""
+
+    def _generate_module_page(self, module: str, files: List[FileAnalysis],
+                              review_feedback: Optional[dict]) -> str:
+        """Generate the documentation page for one module"""
+        budget = FANOUT_SETTINGS.get("max_module_chars", 60000)
+        sources = []
+        for file in sorted(files, key=lambda file: -file.priority):
+            if budget <= 0:
+                sources.append(f"### {file.path}\n(omitted, {file.size} bytes)")
+                continue
+            content = file.content[:budget]
+            budget -= len(content)
+            sources.append(f"### {file.path}\n```\n{content}\n```")
+
+        prompt = f"Write the documentation page for the `{module}` module.\n\n" + "\n\n".join(sources)
+        if review_feedback:
+            prompt += f"\n\nAddress this review feedback where it concerns this module:\n{review_feedback}"
+        return self._complete(
+            "You are a documentation expert. Write a Markdown page for one module of a repository: "
+            "its purpose, architecture, public API with examples, and configuration. "
+            "Start with a level-1 heading naming the module.",
+            prompt
+        )
+
+    def _generate_fan_out_documentation(self, analysis: RepositoryAnalysis, review_feedback: Optional[dict],
+                                        index_link: str) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Generate module pages concurrently, then assemble index.md and README.md from them.
+
+        Returns the generated documents and the error for each module (or
+        overview page) that failed.
+        """
+        modules = self._partition_modules(analysis)
+        # Start the biggest modules first: they set the wall-clock time
+        ordered = sorted(modules, key=lambda name: -sum(file.size for file in modules[name]))
+
+        pages, failed_modules = {}, {}
+        with ThreadPoolExecutor(max_workers=FANOUT_SETTINGS.get("max_parallel_calls", 4)) as executor:
+            # Copy the context so model calls keep the caller's scheduling priority
+            futures = {
+                name: executor.submit(
+                    contextvars.copy_context().run,
+                    self._generate_module_page,
+                    name,
+                    modules[name],
+                    review_feedback
+                )
+                for name in ordered
+            }
+            for name, future in futures.items():
+                try:
+                    pages[name] = future.result()
+                except Exception as e:
+                    print(f"Error generating documentation for {name}: {str(e)}")
+                    failed_modules[name] = str(e)
+
+        docs = {
+            f"modules/{name.replace('/', '-')}.md": content
+            for name, content in pages.items()
+        }
+        summaries = "\n\n".join(
+            f"## Module `{name}` (modules/{name.replace('/', '-')}.md)\n{content[:2000]}"
+            for name, content in sorted(pages.items())
+        )
+        context = (
+            f"Entry points: {', '.join(analysis.entry_points) or 'none detected'}\n"
+            f"External dependencies: {analysis.external_dependencies}\n\n{summaries}"
+        )
+        overview_prompts = {
+            "index.md": "You are a documentation expert. Write index.md for a repository's documentation from "
+                        "its module pages: an architecture overview and a linked table of contents using the "
+                        "given relative module page paths.",
+            "README.md": "You are a documentation expert. Write README.md for a repository from its module "
+                         "pages: what it does, installation/setup, quick start usage, and a link to the documentation index at "
+                         f"{index_link}."
+        }
+        with ThreadPoolExecutor(max_workers=len(overview_prompts)) as executor:
+            futures = {
+                doc_path: executor.submit(contextvars.copy_context().run, self._complete, system, context)
+                for doc_path, system in overview_prompts.items()
+            }
+            for doc_path, future in futures.items():
+                # A failed overview must not lose the module pages already generated
+                try:
+                    docs[doc_path] = future.result()
+                except Exception as e:
+                    print(f"Error generating {doc_path}: {str(e)}")
+                    failed_modules[doc_path] = str(e)
+        return docs, failed_modules
+
+class DocumentMonorepoTool(BaseTool):
+    """Monorepo documenter that splits the repository into per-package shards"""
+    name: ClassVar[str] = "document_monorepo"
+    description: ClassVar[str] = """Detect sub-projects of a monorepo from their dependency manifests and
+    document each one in parallel with its own budget, then merge them into a single index."""
+
+    repo_path: str = Field(description="Full path to the repository to document")
+    max_workers: Optional[int] = Field(
+        description="Maximum number of shards documented at once",
+        default=None
+    )
+
+    def run(self) -> dict:
+        try:
+            repo_path = Path(self.repo_path)
+            if not repo_path.exists():
+                return {"success": False, "error": f"Repository path does not exist: {self.repo_path}"}
+
+            shards = detect_shards(repo_path)
+            if len(shards) < SHARD_SETTINGS.get("min_shards", 2):
+                return {
+                    "success": False,
+                    "error": f"Found {len(shards)} sub-project(s); not a monorepo. "
+                             "Use AnalyzeRepositoryTool and GenerateDocumentationTool instead."
+                }
+
+            results = document_shards(repo_path, shards, self.max_workers)
+            failed = [name for name, result in results.items() if not result["success"]]
+            docs_dir = repo_path / DOCS_OUTPUT_DIR
+
+            return {
+                "success": not failed,
+                "docs_dir": str(docs_dir),
+                "generated_files": sorted(
+                    path.relative_to(repo_path).as_posix()
+                    for path in docs_dir.rglob('*') if path.is_file()
+                ),
+                "shards": [shard.model_dump() for shard in shards],
+                "failed_shards": {name: results[name].get("error") for name in failed}
+            }
+        except Exception as e:
+            return {"success": False, "error": str(e)}
\ No newline at end of file
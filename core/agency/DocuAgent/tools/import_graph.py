@@ -0,0 +1,328 @@
+import ast
+import hashlib
+import json
+import os
+import re
+import subprocess
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional, Set
+from pydantic import BaseModel
+from ...settings.settings import CACHE_DIR, IMPORT_GRAPH_SETTINGS
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+PYTHON_SUFFIXES = {'.py'}
+JS_SUFFIXES = {'.js', '.jsx', '.mjs', '.cjs', '.ts', '.tsx'}
+JS_RESOLVE_SUFFIXES = ['', '.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs']
+PYTHON_SOURCE_ROOTS = ['', 'src', 'lib']
+ENTRY_POINT_NAMES = {
+    'main.py', '__main__.py', 'cli.py', 'app.py', 'manage.py', 'wsgi.py', 'asgi.py',
+    'index.js', 'index.ts', 'main.js', 'main.ts', 'server.js', 'server.ts', 'app.js', 'app.ts'
+}
+
+JS_IMPORT_PATTERN = re.compile(
+    r"""(?:import\s+(?:[^'"]*?\s+from\s+)?|export\s+[^'"]*?\s+from\s+|require\s*\(\s*|import\s*\(\s*)['"]([^'"]+)['"]"""
+)
+REQUIREMENT_PATTERN = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+class ImportGraph(BaseModel):
+    """Intra-repository import graph with external dependencies and rankings"""
+    commit: Optional[str] = None
+    edges: Dict[str, List[str]]
+    external_imports: Dict[str, List[str]]
+    declared_dependencies: Dict[str, List[str]]
+    fan_in: Dict[str, int]
+    centrality: Dict[str, float]
+    entry_points: List[str]
+
+    def ranked_by_fan_in(self, limit: Optional[int] = None) -> List[str]:
+        ranked = sorted(self.fan_in, key=lambda path: (-self.fan_in[path], path))
+        return ranked[:limit] if limit else ranked
+
+    def ranked_by_centrality(self, limit: Optional[int] = None) -> List[str]:
+        ranked = sorted(self.centrality, key=lambda path: (-self.centrality[path], path))
+        return ranked[:limit] if limit else ranked
+
+    def priority(self, path: str) -> float:
+        """Reading priority: entry points first, then by centrality"""
+        return (1.0 if path in self.entry_points else 0.0) + self.centrality.get(path, 0.0)
+
+def current_commit(repo_path: Path) -> Optional[str]:
+    """Return the HEAD commit of a repository, or None if it isn't a git checkout"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=repo_path,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (subprocess.CalledProcessError, OSError):
+        return None
+
+def _python_module_index(paths: List[str]) -> Dict[str, str]:
+    """Map dotted module names to file paths for every supported source root"""
+    index = {}
+    for path in paths:
+        pure = PurePosixPath(path)
+        if pure.suffix not in PYTHON_SUFFIXES:
+            continue
+        for root in PYTHON_SOURCE_ROOTS:
+            if root and (not pure.parts or pure.parts[0] != root):
+                continue
+            parts = list(pure.with_suffix('').parts[1 if root else 0:])
+            if parts and parts[-1] == '__init__':
+                parts = parts[:-1]
+            if parts:
+                index.setdefault('.'.join(parts), path)
+    return index
+
+def _python_imports(path: str, content: str, module_index: Dict[str, str]) -> tuple:
+    """Return (internal paths, external top-level modules) imported by a Python file"""
+    internal, external = set(), set()
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return internal, external
+
+    package = list(PurePosixPath(path).parent.parts)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            candidates = [[alias.name] for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = package[:len(package) - (node.level - 1)] if node.level > 1 else package
+                prefix = '.'.join(base + ([node.module] if node.module else []))
+            else:
+                prefix = node.module or ''
+            # `from a import b` may import the submodule a.b or a name from a
+            candidates = [
+                [f"{prefix}.{alias.name}" if prefix else alias.name, prefix]
+                for alias in node.names
+            ]
+        else:
+            continue
+
+        for names in candidates:
+            resolved = next((module_index[name] for name in names if name in module_index), None)
+            if resolved:
+                internal.add(resolved)
+            elif isinstance(node, ast.Import) or not node.level:
+                top_level = names[-1].split('.')[0]
+                if top_level:
+                    external.add(top_level)
+    return internal, external
+
+def _resolve_js(path: str, specifier: str, known: Set[str]) -> Optional[str]:
+    base = PurePosixPath(path).parent / specifier
+    parts = []
+    for part in base.parts:
+        if part == '..':
+            if parts:
+                parts.pop()
+        elif part != '.':
+            parts.append(part)
+    target = '/'.join(parts)
+    for suffix in JS_RESOLVE_SUFFIXES:
+        if target + suffix in known:
+            return target + suffix
+    for suffix in JS_RESOLVE_SUFFIXES[1:]:
+        if f"{target}/index{suffix}" in known:
+            return f"{target}/index{suffix}"
+    return None
+
+def _js_imports(path: str, content: str, known: Set[str]) -> tuple:
+    """Return (internal paths, external packages) imported by a JS/TS file"""
+    internal, external = set(), set()
+    for specifier in JS_IMPORT_PATTERN.findall(content):
+        if specifier.startswith('.'):
+            resolved = _resolve_js(path, specifier, known)
+            if resolved:
+                internal.add(resolved)
+        elif specifier.startswith('@'):
+            external.add('/'.join(specifier.split('/')[:2]))
+        else:
+            external.add(specifier.split('/')[0])
+    return internal, external
+
+def _declared_dependencies(contents: Dict[str, str]) -> Dict[str, List[str]]:
+    """Parse external dependencies out of the repository's manifests"""
+    declared = {}
+    for path, content in contents.items():
+        name = PurePosixPath(path).name
+        deps = []
+        try:
+            if name == 'requirements.txt':
+                for line in content.splitlines():
+                    if line.strip().startswith(('#', '-')):
+                        continue
+                    match = REQUIREMENT_PATTERN.match(line)
+                    if match:
+                        deps.append(match.group(1))
+            elif name == 'package.json':
+                manifest = json.loads(content)
+                for key in ('dependencies', 'devDependencies', 'peerDependencies'):
+                    deps.extend(manifest.get(key, {}).keys())
+            elif name == 'pyproject.toml' and tomllib:
+                project = tomllib.loads(content).get('project', {})
+                for requirement in project.get('dependencies', []):
+                    match = REQUIREMENT_PATTERN.match(requirement)
+                    if match:
+                        deps.append(match.group(1))
+            else:
+                continue
+        except (ValueError, AttributeError) as e:
+            print(f"Error parsing {path}: {str(e)}")
+            continue
+        declared[path] = sorted(set(deps))
+    return declared
+
+def _js_manifest_entry_points(contents: Dict[str, str], known: Set[str]) -> Set[str]:
+    entry_points = set()
+    for path, content in contents.items():
+        if PurePosixPath(path).name != 'package.json':
+            continue
+        try:
+            manifest = json.loads(content)
+        except ValueError:
+            continue
+        bins = manifest.get('bin', {})
+        targets = [manifest.get('main')] + (list(bins.values()) if isinstance(bins, dict) else [bins])
+        for target in filter(None, targets):
+            resolved = _resolve_js(path, f"./{target}", known)
+            if resolved:
+                entry_points.add(resolved)
+    return entry_points
+
+def _pagerank(nodes: List[str], edges: Dict[str, List[str]]) -> Dict[str, float]:
+    """PageRank where an import passes weight from the importer to the imported file"""
+    if not nodes:
+        return {}
+    damping = IMPORT_GRAPH_SETTINGS.get("damping", 0.85)
+    count = len(nodes)
+    rank = {node: 1.0 / count for node in nodes}
+    for _ in range(IMPORT_GRAPH_SETTINGS.get("iterations", 30)):
+        dangling = sum(rank[node] for node in nodes if not edges.get(node))
+        new_rank = {node: (1 - damping) / count + damping * dangling / count for node in nodes}
+        for node, targets in edges.items():
+            if targets:
+                share = damping * rank[node] / len(targets)
+                for target in targets:
+                    new_rank[target] += share
+        rank = new_rank
+    return {node: round(value, 6) for node, value in rank.items()}
+
+def build_import_graph(contents: Dict[str, str], commit: Optional[str] = None) -> ImportGraph:
+    """Build the import graph in one pass over already-read file contents.
+
+    `contents` maps repository-relative POSIX paths to file text.
+    """
+    known = set(contents)
+    module_index = _python_module_index(list(contents))
+    edges, external_imports = {}, {}
+    nodes = []
+
+    for path, content in contents.items():
+        suffix = PurePosixPath(path).suffix
+        if suffix in PYTHON_SUFFIXES:
+            internal, external = _python_imports(path, content, module_index)
+        elif suffix in JS_SUFFIXES:
+            internal, external = _js_imports(path, content, known)
+        else:
+            continue
+        nodes.append(path)
+        internal.discard(path)
+        edges[path] = sorted(internal)
+        if external:
+            external_imports[path] = sorted(external)
+
+    fan_in = {node: 0 for node in nodes}
+    for targets in edges.values():
+        for target in targets:
+            fan_in[target] = fan_in.get(target, 0) + 1
+
+    entry_points = _js_manifest_entry_points(contents, known)
+    for path in nodes:
+        if fan_in.get(path):
+            continue
+        if PurePosixPath(path).name in ENTRY_POINT_NAMES or (
+            PurePosixPath(path).suffix in PYTHON_SUFFIXES and '__main__' in contents[path]
+        ):
+            entry_points.add(path)
+
+    return ImportGraph(
+        commit=commit,
+        edges=edges,
+        external_imports=external_imports,
+        declared_dependencies=_declared_dependencies(contents),
+        fan_in=fan_in,
+        centrality=_pagerank(nodes, edges),
+        entry_points=sorted(entry_points)
+    )
+
+def content_key(contents: Dict[str, str]) -> str:
+    """Cache key for exactly the analysed files.
+
+    Different subtrees of one checkout, excluded directories and uncommitted
+    edits all give different keys, where HEAD alone would not.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(contents):
+        digest.update(path.encode())
+        digest.update(b'\0')
+        digest.update(hashlib.sha256(contents[path].encode(errors='replace')).digest())
+    return digest.hexdigest()
+
+def _cache_path(key: str) -> Path:
+    return Path(CACHE_DIR) / "import_graph" / f"{key}.json"
+
+def load_cached_graph(key: str) -> Optional[ImportGraph]:
+    """Return the persisted graph for a cache key, if any"""
+    cache_path = _cache_path(key)
+    if not cache_path.exists():
+        return None
+    try:
+        graph = ImportGraph.model_validate_json(cache_path.read_text())
+    except ValueError:
+        return None
+    # The modification time records the last use for eviction
+    os.utime(cache_path)
+    return graph
+
+def evict_cached_graphs() -> List[str]:
+    """Delete least recently used graphs until the cache fits its size limit"""
+    max_bytes = IMPORT_GRAPH_SETTINGS.get("cache_max_bytes", 50 * 1024 * 1024)
+    entries = []
+    for cache_path in (Path(CACHE_DIR) / "import_graph").glob("*.json"):
+        try:
+            stat = cache_path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, cache_path))
+
+    total = sum(size for _, size, _ in entries)
+    evicted = []
+    for _, size, cache_path in sorted(entries, key=lambda entry: entry[0]):
+        if total <= max_bytes:
+            break
+        cache_path.unlink(missing_ok=True)
+        total -= size
+        evicted.append(str(cache_path))
+    return evicted
+
+def get_import_graph(repo_path: Path, contents: Dict[str, str]) -> ImportGraph:
+    """Return the import graph for the analysed files, building and persisting it once per content"""
+    key = content_key(contents)
+    cached = load_cached_graph(key)
+    if cached:
+        return cached
+
+    graph = build_import_graph(contents, current_commit(repo_path))
+    cache_path = _cache_path(key)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(graph.model_dump_json())
+    evict_cached_graphs()
+    return graph
@@ -0,0 +1,127 @@
+import mmap
+import re
+from pathlib import Path
+from typing import Dict, List
+from ...settings.settings import LARGE_FILE_SETTINGS
+
+GENERATED_MARKERS = re.compile(
+    rb"@generated|do not edit|auto-?generated|code generated by|generated by the protocol buffer",
+    re.IGNORECASE
+)
+FORMATS_BY_SUFFIX = {
+    '.sql': 'sql', '.csv': 'csv', '.tsv': 'tsv', '.json': 'json', '.jsonl': 'jsonl',
+    '.xml': 'xml', '.html': 'html', '.svg': 'svg', '.yaml': 'yaml', '.yml': 'yaml',
+    '.log': 'log', '.js': 'javascript', '.mjs': 'javascript', '.css': 'css',
+    '.map': 'sourcemap', '.lock': 'lockfile', '.txt': 'text', '.md': 'markdown'
+}
+LINE_COUNT_CHUNK = 1 << 20
+
+def needs_sampling(path: Path, size: int) -> bool:
+    """Whether a file should be described instead of read in full"""
+    if size > LARGE_FILE_SETTINGS.get("max_full_read_bytes", 1_000_000):
+        return True
+    if size < LARGE_FILE_SETTINGS.get("inspect_bytes", 65_536):
+        return False
+    # Medium-sized files are only sampled when they are minified or generated
+    with open(path, 'rb') as f:
+        head = f.read(LARGE_FILE_SETTINGS.get("head_bytes", 4096))
+    return _is_minified(head) or bool(GENERATED_MARKERS.search(head))
+
+def _is_minified(sample: bytes) -> bool:
+    lines = sample.split(b'\n')
+    if len(lines) > 1:
+        lines = lines[:-1]  # the last line is probably cut off
+    longest = max((len(line) for line in lines), default=0)
+    return longest >= LARGE_FILE_SETTINGS.get("minified_line_length", 1000)
+
+def _detect_format(path: Path, head: bytes) -> str:
+    if b'\0' in head:
+        return 'binary'
+    if path.suffix.lower() in FORMATS_BY_SUFFIX:
+        return FORMATS_BY_SUFFIX[path.suffix.lower()]
+    stripped = head.lstrip()
+    if stripped[:1] in (b'{', b'['):
+        return 'json'
+    if stripped[:1] == b'<':
+        return 'xml'
+    if re.match(rb"(--|/\*|CREATE |INSERT |DROP |SET )", stripped, re.IGNORECASE):
+        return 'sql'
+    return 'text'
+
+def _count_lines(mm: mmap.mmap) -> int:
+    count = 0
+    for offset in range(0, len(mm), LINE_COUNT_CHUNK):
+        count += mm[offset:offset + LINE_COUNT_CHUNK].count(b'\n')
+    if len(mm) and mm[-1:] != b'\n':
+        count += 1
+    return count
+
+def _structural_samples(mm: mmap.mmap, head_end: int, tail_start: int) -> List[Dict[str, object]]:
+    """Evenly spaced samples from the middle of the file, aligned to line starts"""
+    count = LARGE_FILE_SETTINGS.get("sample_count", 5)
+    sample_bytes = LARGE_FILE_SETTINGS.get("sample_bytes", 1024)
+    span = tail_start - head_end
+    if count <= 0 or span <= sample_bytes:
+        return []
+
+    samples = []
+    for i in range(1, count + 1):
+        offset = head_end + span * i // (count + 1)
+        newline = mm.find(b'\n', offset, min(offset + sample_bytes, tail_start))
+        start = newline + 1 if newline != -1 else offset
+        end = min(start + sample_bytes, tail_start)
+        samples.append({
+            "offset": start,
+            "text": mm[start:end].decode('utf-8', errors='replace')
+        })
+    return samples
+
+def describe_large_file(path: Path) -> Dict[str, object]:
+    """Compact descriptor of a file built from memory-mapped samples.
+
+    Only the sampled regions are decoded, so the file is never loaded into
+    memory as a whole.
+    """
+    path = Path(path)
+    head_bytes = LARGE_FILE_SETTINGS.get("head_bytes", 4096)
+    tail_bytes = LARGE_FILE_SETTINGS.get("tail_bytes", 2048)
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        head_end = min(size, head_bytes)
+        tail_start = max(head_end, size - tail_bytes)
+        head = mm[:head_end]
+        file_format = _detect_format(path, head)
+
+        descriptor = {
+            "size": size,
+            "format": file_format,
+            "generated": bool(GENERATED_MARKERS.search(head)),
+            "minified": file_format != 'binary' and _is_minified(head),
+        }
+        if file_format == 'binary':
+            return descriptor
+
+        descriptor.update({
+            "line_count": _count_lines(mm),
+            "head": head.decode('utf-8', errors='replace'),
+            "tail": mm[tail_start:].decode('utf-8', errors='replace'),
+            "samples": _structural_samples(mm, head_end, tail_start),
+        })
+        return descriptor
+
+def render_descriptor(rel_path: str, descriptor: Dict[str, object]) -> str:
+    """Text stand-in for a sampled file's content"""
+    flags = [flag for flag in ("generated", "minified") if descriptor.get(flag)]
+    lines = [
+        f"[Sampled file: {rel_path}]",
+        f"Size: {descriptor['size']} bytes"
+        + (f", {descriptor['line_count']} lines" if "line_count" in descriptor else ""),
+        f"Format: {descriptor['format']}" + (f" ({', '.join(flags)})" if flags else ""),
+    ]
+    if "head" in descriptor:
+        lines += ["", "--- head ---", descriptor["head"]]
+        for sample in descriptor["samples"]:
+            lines += [f"--- sample at byte {sample['offset']} ---", sample["text"]]
+        lines += ["--- tail ---", descriptor["tail"]]
+    return '\n'.join(lines)
@@ -4,7 +4,8 @@ from .tools.git_tools import (
     CreateBranchTool,
     CommitChangesTool,
     PushChangesTool,
-    CreatePullRequestTool
+    CreatePullRequestTool,
+    PublishDocumentationTool
 )
 import os
 from ..settings.settings import GIT_AGENT_ID, DEFAULT_MODEL, AGENT_SETTINGS, GITHUB_TOKEN
@@ -24,6 +25,7 @@ class GitAgent(Agent):
                 - Committing changes
                 - Pushing updates
                 - Creating pull requests
+                - Publishing documentation (commit, push and pull request in one step)
                 
                 I use settings or environment variables for authentication.""",
             instructions="instructions.md",
@@ -32,7 +34,8 @@ class GitAgent(Agent):
                 CreateBranchTool,
                 CommitChangesTool,
                 PushChangesTool,
-                CreatePullRequestTool
+                CreatePullRequestTool,
+                PublishDocumentationTool
             ],
             model=AGENT_SETTINGS.get("model", DEFAULT_MODEL),
             temperature=AGENT_SETTINGS.get("temperature", 0.3),
@@ -4,9 +4,11 @@ import os
 from pathlib import Path
 from datetime import datetime
 from github import Github
-from typing import ClassVar, Dict, Optional
+from typing import ClassVar, Dict, List, Optional
 from pydantic import Field
 from ...settings.settings import FILES_DIR, GITHUB_TOKEN
+from ...workspace import current_workspace
+from ...artifact_store import APPROVED_STATUS, ArtifactStore, tree_sha
 
 class SafeFormatter:
     """Format strings while removing sensitive data"""
@@ -18,6 +20,78 @@ class SafeFormatter:
             text = text.replace(token, "***")
         return text
 
+# Supplies the token from the environment, so it never appears in argv or .git/config.
+# The empty helper first clears any helpers configured globally.
+CREDENTIAL_HELPER_ARGS = [
+    '-c', 'credential.helper=',
+    '-c', 'credential.helper=!f() { echo username=x-access-token; echo "password=$GITHUB_TOKEN"; }; f'
+]
+
+def run_authenticated_git(args: List[str], cwd: Optional[str], github_token: str) -> subprocess.CompletedProcess:
+    """Run a git command that talks to the remote, authenticating via the credential helper"""
+    env = dict(os.environ, GITHUB_TOKEN=github_token, GIT_TERMINAL_PROMPT='0')
+    return subprocess.run(
+        ['git', *CREDENTIAL_HELPER_ARGS, *args],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+def repository_from_remote(repo_path: str) -> str:
+    """Derive 'owner/repo' from the origin remote URL"""
+    remote_url = subprocess.run(
+        ['git', 'remote', 'get-url', 'origin'],
+        cwd=repo_path,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout.strip()
+    path = remote_url.split('github.com', 1)[-1].lstrip(':/')
+    if path.endswith('.git'):
+        path = path[:-len('.git')]
+    return '/'.join(path.split('/')[:2])
+
+def commit_files(repo_path: str, files: List[str], message: str) -> bool:
+    """Stage and commit only the given files; return whether anything changed"""
+    subprocess.run(
+        ['git', 'add', '--', *files],
+        cwd=repo_path,
+        check=True,
+        capture_output=True,
+        text=True
+    )
+    staged = subprocess.run(
+        ['git', 'diff', '--cached', '--quiet', '--', *files],
+        cwd=repo_path,
+        capture_output=True,
+        text=True
+    )
+    if staged.returncode == 0:
+        return False
+    subprocess.run(
+        ['git', 'commit', '-m', message, '--', *files],
+        cwd=repo_path,
+        check=True,
+        capture_output=True,
+        text=True
+    )
+    return True
+
+def open_or_update_pull_request(github_token: str, repository: str, branch_name: str, target_branch: str,
+                                title: str, body: str):
+    """Update the open pull request for the branch, or create one; return (pr, updated)"""
+    repo = Github(github_token).get_repo(repository)
+    owner = repository.split('/')[0]
+
+    open_prs = repo.get_pulls(state="open", head=f"{owner}:{branch_name}", base=target_branch)
+    pr = next(iter(open_prs), None)
+    if pr is not None:
+        pr.edit(title=title, body=body)
+        return pr, True
+    return repo.create_pull(title=title, body=body, head=branch_name, base=target_branch), False
+
 class CloneRepositoryTool(BaseTool):
     """Clone a repository using GITHUB_TOKEN from settings or environment"""
     name: ClassVar[str] = "clone_repository"
@@ -27,6 +101,10 @@ class CloneRepositoryTool(BaseTool):
     repository_url: str = Field(
         description="URL of the repository to clone (https://github.com/owner/repo format)"
     )
+    workspace: Optional[str] = Field(
+        default=None,
+        description="Directory to clone into (defaults to the files directory; always the job's workspace inside a job)"
+    )
 
     def run(self) -> dict:
         try:
@@ -34,8 +112,8 @@ class CloneRepositoryTool(BaseTool):
             if not github_token:
                 return {"success": False, "error": "GitHub token not found in settings or environment"}
 
-            # Create files directory if it doesn't exist
-            files_dir = Path(FILES_DIR)
+            # Create files directory if it doesn't exist; a running job always clones into its own workspace
+            files_dir = Path(current_workspace.get() or self.workspace or FILES_DIR)
             files_dir.mkdir(parents=True, exist_ok=True)
             
             # Create unique directory for this repo
@@ -44,14 +122,12 @@ class CloneRepositoryTool(BaseTool):
             repo_dir = files_dir / f"{repo_name}_{timestamp}"
             repo_dir.mkdir(parents=True, exist_ok=True)
 
-            # Clone with authentication but don't log the token
-            auth_url = self.repository_url.replace('https://', f'https://{github_token}@')
+            # Clone with authentication but don't log or store the token
             try:
-                result = subprocess.run(
-                    ['git', 'clone', auth_url, str(repo_dir)],
-                    capture_output=True,
-                    text=True,
-                    check=True
+                result = run_authenticated_git(
+                    ['clone', self.repository_url, str(repo_dir)],
+                    None,
+                    github_token
                 )
                 # Clean any token from output
                 safe_stdout = SafeFormatter.clean_sensitive_data(result.stdout)
@@ -149,38 +225,12 @@ class PushChangesTool(BaseTool):
             if not github_token:
                 return {"success": False, "error": "GitHub token not found in settings or environment"}
 
-            # Get the current remote URL
-            remote_url = subprocess.run(
-                ['git', 'remote', 'get-url', 'origin'],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                check=True
-            ).stdout.strip()
-            
-            # Clean and format the remote URL
-            base_url = remote_url.replace('https://', '').replace('http://', '')
-            if '@' in base_url:
-                base_url = base_url.split('@')[1]
-            auth_url = f'https://{github_token}@{base_url}'
-            
-            # Set the authenticated remote URL
             try:
-                subprocess.run(
-                    ['git', 'remote', 'set-url', 'origin', auth_url],
-                    cwd=self.repo_path,
-                    check=True,
-                    capture_output=True,
-                    text=True
-                )
-
                 # Push changes
-                result = subprocess.run(
-                    ['git', 'push', '-u', 'origin', self.branch_name],
-                    cwd=self.repo_path,
-                    check=True,
-                    capture_output=True,
-                    text=True
+                result = run_authenticated_git(
+                    ['push', '-u', 'origin', self.branch_name],
+                    self.repo_path,
+                    github_token
                 )
                 # Clean any token from output
                 safe_stdout = SafeFormatter.clean_sensitive_data(result.stdout)
@@ -234,6 +284,106 @@ class CreatePullRequestTool(BaseTool):
                 "pr_number": pr.number,
                 "status": pr.state
             }
+        except Exception as e:
+            error_msg = SafeFormatter.clean_sensitive_data(str(e))
+            return {"success": False, "error": error_msg}
+
+class PublishDocumentationTool(BaseTool):
+    """Commit, push and open a pull request for generated documentation in one step"""
+    name: ClassVar[str] = "publish_documentation"
+    description: ClassVar[str] = """Publish generated documentation in a single step: stage only the given files,
+    commit, push the branch, and open a pull request (or update the open one for the branch).
+    Authentication is handled automatically using GITHUB_TOKEN from settings/environment."""
+
+    repo_path: str = Field(description="Path to repository")
+    files: List[str] = Field(
+        description="Files to publish, relative to the repository (generated_files from GenerateDocumentationTool)"
+    )
+    branch_name: str = Field(description="Branch to commit to and push")
+    commit_message: str = Field(description="Commit message")
+    title: str = Field(description="Pull request title")
+    description: str = Field(description="Pull request description")
+    repository: Optional[str] = Field(
+        default=None,
+        description="Repository name in format 'owner/repo' (defaults to the origin remote)"
+    )
+    target_branch: str = Field(
+        default="main",
+        description="Base branch to merge into"
+    )
+    review_metrics: Optional[dict] = Field(
+        default=None,
+        description="Final metrics from ProvideFeedbackTool, stored with the published documentation"
+    )
+    review_status: Optional[str] = Field(
+        default=None,
+        description="Final status from ProvideFeedbackTool; only 'approved' documentation is stored for reuse"
+    )
+
+    def run(self) -> dict:
+        try:
+            github_token = GITHUB_TOKEN or os.getenv("GITHUB_TOKEN")
+            if not github_token:
+                return {"success": False, "error": "GitHub token not found in settings or environment"}
+            if not self.files:
+                return {"success": False, "error": "No files to publish"}
+            repo_root = Path(self.repo_path).resolve()
+            outside = [
+                path for path in self.files
+                if not (repo_root / path).resolve().is_relative_to(repo_root)
+            ]
+            if outside:
+                return {
+                    "success": False,
+                    "error": f"Files outside the repository {self.repo_path} cannot be published: "
+                             f"{', '.join(outside)}. Write the documentation inside the repository "
+                             "(GenerateDocumentationTool defaults to its docs/ directory)."
+                }
+
+            try:
+                # The documented source tree, before the documentation is committed
+                source_tree = tree_sha(self.repo_path)
+
+                # Stage and commit only the documentation files
+                committed = commit_files(self.repo_path, self.files, self.commit_message)
+
+                run_authenticated_git(
+                    ['push', '-u', 'origin', self.branch_name],
+                    self.repo_path,
+                    github_token
+                )
+            except subprocess.CalledProcessError as e:
+                safe_stderr = SafeFormatter.clean_sensitive_data(e.stderr or "")
+                return {"success": False, "error": f"Git error: {safe_stderr}"}
+
+            repository = self.repository or repository_from_remote(self.repo_path)
+            if self.review_status == APPROVED_STATUS:
+                try:
+                    # Keep approved docs so a later run on the same tree can skip the pipeline
+                    ArtifactStore().put(
+                        repository, source_tree, self.repo_path, self.files, self.review_status, self.review_metrics
+                    )
+                except Exception as e:
+                    print(f"Error storing documentation artifact: {SafeFormatter.clean_sensitive_data(str(e))}")
+
+            # Reuse the open pull request for this branch if there is one
+            pr, updated = open_or_update_pull_request(
+                github_token,
+                repository,
+                self.branch_name,
+                self.target_branch,
+                self.title,
+                self.description
+            )
+
+            return {
+                "success": True,
+                "committed": committed,
+                "pr_url": pr.html_url,
+                "pr_number": pr.number,
+                "pr_updated": updated,
+                "status": pr.state
+            }
         except Exception as e:
             error_msg = SafeFormatter.clean_sensitive_data(str(e))
             return {"success": False, "error": error_msg}
\ No newline at end of file
@@ -0,0 +1,185 @@
+import ast
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+from ...settings.settings import IGNORE_DIRS, TEST_DIRS
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$", re.MULTILINE)
+LINK_PATTERN = re.compile(r"(?<!!)\[[^\]]*\]\(\s*<?([^)\s>]+)>?(?:\s+\"[^\"]*\")?\s*\)")
+CODE_BLOCK_PATTERN = re.compile(r"^```[ \t]*([\w+-]*)[^\n]*\n(.*?)^```", re.MULTILINE | re.DOTALL)
+JS_EXPORT_PATTERN = re.compile(
+    r"^\s*export\s+(?:default\s+)?(?:async\s+)?"
+    r"(?:function\*?|class|const|let|var|interface|type|enum)\s+([A-Za-z_$][\w$]*)",
+    re.MULTILINE
+)
+TEST_FILE_PATTERN = re.compile(r"^test_.*\.py$|_test\.\w+$|\.(?:spec|test)\.[jt]sx?$")
+TEST_CLASS_PATTERN = re.compile(r"^Test(?:[A-Z_]|$)")
+MARKDOWN_LINK_PATTERN = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+CODE_SPAN_PATTERN = re.compile(r"(`+[^`]*`+)")
+UNDERSCORE_EMPHASIS_PATTERN = re.compile(r"(?<!\w)(__?)(\S(?:.*?\S)?)\1(?!\w)")
+EXTERNAL_LINK_PREFIXES = ('http://', 'https://', 'mailto:', 'ftp://', '//')
+
+SETUP_SECTION_PATTERN = re.compile(r"install|setup|set up|getting started|quick ?start|requirements", re.IGNORECASE)
+API_SECTION_PATTERN = re.compile(r"\bapi\b|reference|usage|interface", re.IGNORECASE)
+
+def slugify(heading: str) -> str:
+    """GitHub-style anchor for a markdown heading.
+
+    Underscores are kept, as GitHub does, except where they mark emphasis
+    around words outside code spans.
+    """
+    text = MARKDOWN_LINK_PATTERN.sub(r"\1", heading)
+    text = "".join(
+        part if part.startswith("`") else UNDERSCORE_EMPHASIS_PATTERN.sub(r"\2", part)
+        for part in CODE_SPAN_PATTERN.split(text)
+    )
+    text = re.sub(r"[^\w\s-]", "", text.strip().lower())
+    return re.sub(r"\s", "-", text)
+
+def heading_anchors(content: str) -> Set[str]:
+    """All anchors a markdown page exposes, including -1, -2 suffixes for repeats"""
+    anchors, seen = set(), {}
+    for _, heading in HEADING_PATTERN.findall(strip_code_blocks(content)):
+        slug = slugify(heading)
+        count = seen.get(slug, 0)
+        anchors.add(slug if count == 0 else f"{slug}-{count}")
+        seen[slug] = count + 1
+    return anchors
+
+def strip_code_blocks(content: str) -> str:
+    return CODE_BLOCK_PATTERN.sub("", content)
+
+def is_test_file(path: str) -> bool:
+    return bool(TEST_FILE_PATTERN.search(Path(path).name))
+
+def is_documentable_source(rel_path: str) -> bool:
+    """Whether a file relative to the codebase root counts towards symbol coverage.
+
+    Tests, fixtures, hidden folders and IGNORE_DIRS (dependencies, virtualenvs,
+    build output) are not part of the documented API.
+    """
+    parts = Path(rel_path).parts
+    if any(part in IGNORE_DIRS or part in TEST_DIRS or part.startswith('.') for part in parts[:-1]):
+        return False
+    return not is_test_file(rel_path)
+
+def public_symbols(code_files: Dict[str, str]) -> Dict[str, List[str]]:
+    """Map each non-test source file to the public names it defines"""
+    symbols = {}
+    for path, content in code_files.items():
+        if is_test_file(path):
+            continue
+        names = []
+        if path.endswith('.py'):
+            try:
+                tree = ast.parse(content)
+            except (SyntaxError, ValueError):
+                continue
+            for node in tree.body:
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)) \
+                        and not node.name.startswith('_') and not TEST_CLASS_PATTERN.match(node.name):
+                    names.append(node.name)
+                    if isinstance(node, ast.ClassDef):
+                        names.extend(
+                            child.name for child in node.body
+                            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef))
+                            and not child.name.startswith('_')
+                        )
+        else:
+            names = JS_EXPORT_PATTERN.findall(content)
+        if names:
+            symbols[path] = sorted(set(names))
+    return symbols
+
+def symbol_coverage(doc_files: Dict[str, str], code_files: Dict[str, str]) -> Tuple[float, int, List[str]]:
+    """Return (coverage ratio, public symbol count, undocumented symbols)"""
+    doc_words = set(re.findall(r"[A-Za-z_$][\w$]*", "\n".join(doc_files.values())))
+    total, undocumented = 0, []
+    for path, names in public_symbols(code_files).items():
+        for name in names:
+            total += 1
+            if name not in doc_words:
+                undocumented.append(f"{Path(path).name}:{name}")
+    coverage = 1.0 if total == 0 else (total - len(undocumented)) / total
+    return round(coverage, 3), total, undocumented
+
+def broken_links(doc_files: Dict[str, str]) -> List[Dict[str, str]]:
+    """Internal links whose target file or anchor does not exist"""
+    anchors_cache = {}
+
+    def anchors_for(path: Path) -> Set[str]:
+        key = str(path)
+        if key not in anchors_cache:
+            content = doc_files.get(key)
+            if content is None:
+                try:
+                    content = path.read_text()
+                except (OSError, UnicodeDecodeError):
+                    content = ""
+            anchors_cache[key] = heading_anchors(content)
+        return anchors_cache[key]
+
+    broken = []
+    for doc_path, content in doc_files.items():
+        for target in LINK_PATTERN.findall(strip_code_blocks(content)):
+            if target.startswith(EXTERNAL_LINK_PREFIXES):
+                continue
+            file_part, _, anchor = target.partition('#')
+            target_path = Path(doc_path) if not file_part else (Path(doc_path).parent / file_part).resolve()
+
+            if file_part and str(target_path) not in doc_files and not target_path.exists():
+                broken.append({"file": doc_path, "link": target, "reason": "missing file"})
+            elif anchor and target_path.suffix == '.md' and anchor.lower() not in anchors_for(target_path):
+                broken.append({"file": doc_path, "link": target, "reason": "missing anchor"})
+    return broken
+
+def missing_sections(doc_files: Dict[str, str]) -> List[str]:
+    """Expected sections that no documentation page has a heading for"""
+    headings = [
+        heading
+        for content in doc_files.values()
+        for _, heading in HEADING_PATTERN.findall(strip_code_blocks(content))
+    ]
+    missing = []
+    if not any(SETUP_SECTION_PATTERN.search(heading) for heading in headings):
+        missing.append("setup")
+    if not any(API_SECTION_PATTERN.search(heading) for heading in headings):
+        missing.append("api")
+    return missing
+
+def invalid_code_blocks(doc_files: Dict[str, str]) -> List[Dict[str, str]]:
+    """Python and JSON code blocks that fail to parse"""
+    invalid = []
+    for doc_path, content in doc_files.items():
+        for language, code in CODE_BLOCK_PATTERN.findall(content):
+            language = language.lower()
+            try:
+                if language in ('python', 'py'):
+                    if '>>>' in code:
+                        continue  # interactive session, not a module
+                    ast.parse(code)
+                elif language == 'json':
+                    json.loads(code)
+            except (SyntaxError, ValueError) as e:
+                invalid.append({"file": doc_path, "language": language, "error": str(e)})
+    return invalid
+
+def word_counts(doc_files: Dict[str, str]) -> Dict[str, int]:
+    return {
+        path: len(strip_code_blocks(content).split())
+        for path, content in doc_files.items()
+    }
+
+def calculate_metrics(doc_files: Dict[str, str], code_files: Dict[str, str]) -> Dict:
+    """Deterministic documentation metrics computed without the model"""
+    coverage, symbol_count, undocumented = symbol_coverage(doc_files, code_files)
+    return {
+        "symbol_coverage": coverage,
+        "public_symbols": symbol_count,
+        "undocumented_symbols": undocumented,
+        "broken_links": broken_links(doc_files),
+        "missing_sections": missing_sections(doc_files),
+        "invalid_code_blocks": invalid_code_blocks(doc_files),
+        "word_counts": word_counts(doc_files),
+    }
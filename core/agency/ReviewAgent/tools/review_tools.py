@@ -2,6 +2,8 @@ from agency_swarm.tools import BaseTool
 from pathlib import Path
 from typing import ClassVar, Dict, List, Any
 from pydantic import Field
+from .review_metrics import calculate_metrics, is_documentable_source
+from ...settings.settings import REVIEW_THRESHOLDS
 
 class AnalyzeDocumentationCoverageAndQualityTool(BaseTool):
     """Analyze documentation completeness and quality"""
@@ -56,10 +58,12 @@ class ValidateAgainstCodebaseTool(BaseTool):
             doc_files = self.analysis["files"]
             codebase_path = Path(self.analysis["codebase_path"])
 
-            # Read relevant code files
+            # Read the source files that make up the documented API
             code_files = {}
             for ext in ['.py', '.js', '.ts', '.jsx', '.tsx']:
                 for file_path in codebase_path.rglob(f"*{ext}"):
+                    if not is_documentable_source(file_path.relative_to(codebase_path).as_posix()):
+                        continue
                     try:
                         content = file_path.read_text()
                         code_files[str(file_path)] = content
@@ -91,12 +95,14 @@ class ProvideFeedbackTool(BaseTool):
             doc_files = self.validation["documentation"]
             code_files = self.validation["codebase"]
 
-            # Let LLM generate detailed feedback
+            # Status and improvements both come from the local metrics
+            metrics = self._calculate_metrics(doc_files, code_files)
+            critical_issues = self._find_critical_issues(metrics)
             feedback = {
-                "status": self._determine_status(doc_files, code_files),
-                "critical_issues": self._find_critical_issues(doc_files, code_files),
-                "improvements": self._suggest_improvements(doc_files, code_files),
-                "metrics": self._calculate_metrics(doc_files)
+                "status": self._determine_status(critical_issues),
+                "critical_issues": critical_issues,
+                "improvements": self._suggest_improvements(metrics),
+                "metrics": metrics
             }
 
             return {
@@ -106,20 +112,68 @@ class ProvideFeedbackTool(BaseTool):
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    def _determine_status(self, doc_files: Dict[str, str], code_files: Dict[str, str]) -> str:
+    def _determine_status(self, critical_issues: List[Dict[str, str]]) -> str:
         """Determine overall documentation status"""
-        return "needs_review"  # Placeholder for LLM determination
-
-    def _find_critical_issues(self, doc_files: Dict[str, str], 
-                            code_files: Dict[str, str]) -> List[Dict[str, str]]:
-        """Identify critical documentation issues"""
-        return []  # Placeholder for LLM analysis
-
-    def _suggest_improvements(self, doc_files: Dict[str, str], 
-                            code_files: Dict[str, str]) -> List[Dict[str, str]]:
+        return "needs_revision" if critical_issues else "approved"
+
+    def _find_critical_issues(self, metrics: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Identify critical documentation issues from threshold violations"""
+        issues = []
+
+        min_coverage = REVIEW_THRESHOLDS.get("min_symbol_coverage", 0.8)
+        if metrics["symbol_coverage"] < min_coverage:
+            issues.append({
+                "section": "API Reference",
+                "issue": f"Only {metrics['symbol_coverage']:.0%} of public symbols are documented",
+                "recommendation": "Document: " + ", ".join(metrics["undocumented_symbols"][:20]),
+                "priority": "high"
+            })
+
+        if len(metrics["broken_links"]) > REVIEW_THRESHOLDS.get("max_broken_links", 0):
+            for link in metrics["broken_links"]:
+                issues.append({
+                    "section": link["file"],
+                    "issue": f"Broken link {link['link']} ({link['reason']})",
+                    "recommendation": "Fix the link target or add the referenced section",
+                    "priority": "high"
+                })
+
+        if len(metrics["invalid_code_blocks"]) > REVIEW_THRESHOLDS.get("max_invalid_code_blocks", 0):
+            for block in metrics["invalid_code_blocks"]:
+                issues.append({
+                    "section": block["file"],
+                    "issue": f"{block['language']} code block does not parse: {block['error']}",
+                    "recommendation": "Correct the example so it is valid code",
+                    "priority": "high"
+                })
+
+        required = REVIEW_THRESHOLDS.get("required_sections", ["setup", "api"])
+        for section in metrics["missing_sections"]:
+            if section in required:
+                issues.append({
+                    "section": section,
+                    "issue": f"No {section} section found",
+                    "recommendation": f"Add a {section} section",
+                    "priority": "high"
+                })
+
+        return issues
+
+    def _suggest_improvements(self, metrics: Dict[str, Any]) -> List[Dict[str, str]]:
         """Suggest documentation improvements"""
-        return []  # Placeholder for LLM suggestions
+        min_words = REVIEW_THRESHOLDS.get("min_words_per_page", 50)
+        return [
+            {
+                "section": path,
+                "suggestion": "Expand this page",
+                "context": f"Only {count} words (minimum {min_words})",
+                "priority": "medium"
+            }
+            for path, count in metrics["word_counts"].items()
+            if count < min_words
+        ]
 
-    def _calculate_metrics(self, doc_files: Dict[str, str]) -> Dict[str, Any]:
+    def _calculate_metrics(self, doc_files: Dict[str, str],
+                           code_files: Dict[str, str]) -> Dict[str, Any]:
         """Calculate documentation quality metrics"""
-        return {}  # Placeholder for LLM metrics
\ No newline at end of file
+        return calculate_metrics(doc_files, code_files)
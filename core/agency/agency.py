@@ -4,9 +4,13 @@ from .CEOAgent.CEOAgent import CEOAgent
 from .GitAgent.gitAgent import GitAgent
 from .ReviewAgent.reviewAgent import ReviewAgent
 from .settings.settings import AGENT_SETTINGS
+from .scheduler import install_scheduler
 import os
 
 def create_agency():
+    # Share request and token budgets with every other agency in the process
+    install_scheduler()
+
     # Initialize the agents first
     ceo_agent = CEOAgent()
     docu_agent = DocuAgent()
@@ -0,0 +1,248 @@
+import hashlib
+import json
+import shutil
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel
+from .settings.settings import (
+    ARTIFACTS_DIR,
+    ARTIFACT_STORE_SETTINGS,
+    AGENT_SETTINGS,
+    REVIEW_THRESHOLDS,
+    FANOUT_SETTINGS
+)
+
+MANIFEST_FILE = "manifest.json"
+# ProvideFeedbackTool status of documentation that passed review; nothing else is reused
+APPROVED_STATUS = "approved"
+
+class Artifact(BaseModel):
+    """Final reviewed documentation for one repository tree"""
+    repository: str
+    tree_sha: str
+    fingerprint: str
+    files: List[str]
+    status: str = ""
+    metrics: Dict[str, Any] = {}
+    created_at: str
+    last_used: float
+    path: str
+
+def settings_fingerprint() -> str:
+    """Hash of the model and settings that shape the generated documentation"""
+    relevant = {
+        "model": AGENT_SETTINGS.get("model"),
+        "temperature": AGENT_SETTINGS.get("temperature"),
+        "max_prompt_tokens": AGENT_SETTINGS.get("max_prompt_tokens"),
+        "review_thresholds": REVIEW_THRESHOLDS,
+        "fanout": FANOUT_SETTINGS,
+    }
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True, default=str).encode()).hexdigest()
+
+def tree_sha(repo_path: str, revision: str = "HEAD") -> str:
+    """SHA of the source tree at a revision; identical content gives an identical SHA"""
+    return subprocess.run(
+        ['git', 'rev-parse', f'{revision}^{{tree}}'],
+        cwd=repo_path,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout.strip()
+
+class ArtifactStore:
+    """Local store of documentation artifacts keyed by repository and tree SHA.
+
+    Least recently used artifacts are evicted once the store grows past
+    ARTIFACT_STORE_SETTINGS['max_bytes'].
+    """
+
+    def __init__(self, root: Path = ARTIFACTS_DIR):
+        self.root = Path(root)
+
+    def _artifact_dir(self, repository: str, tree: str) -> Path:
+        return self.root / repository.lower().replace('/', '__') / tree
+
+    def get(self, repository: str, tree: str, fingerprint: Optional[str] = None) -> Optional[Artifact]:
+        """Return the artifact on an exact hit (same repository, tree and settings fingerprint).
+
+        An artifact that was not approved in review, has no files, or has files
+        missing from the store, is a miss.
+        """
+        manifest_path = self._artifact_dir(repository, tree) / MANIFEST_FILE
+        if not manifest_path.exists():
+            return None
+        try:
+            artifact = Artifact.model_validate_json(manifest_path.read_text())
+        except ValueError:
+            return None
+        if artifact.fingerprint != (fingerprint or settings_fingerprint()) or artifact.status != APPROVED_STATUS:
+            return None
+        files_dir = Path(artifact.path) / "files"
+        if not artifact.files or not all((files_dir / rel_path).is_file() for rel_path in artifact.files):
+            return None
+
+        artifact.last_used = time.time()
+        manifest_path.write_text(artifact.model_dump_json())
+        return artifact
+
+    def put(self, repository: str, tree: str, repo_path: str, files: List[str], status: str,
+            metrics: Optional[Dict[str, Any]] = None) -> Optional[Artifact]:
+        """Copy approved documentation files out of a checkout and record them.
+
+        Nothing is stored (and None is returned) unless the review status is
+        approved and at least one of the files could be copied.
+        """
+        if status != APPROVED_STATUS:
+            return None
+        artifact_dir = self._artifact_dir(repository, tree)
+        if artifact_dir.exists():
+            shutil.rmtree(artifact_dir)
+        files_dir = artifact_dir / "files"
+
+        stored = []
+        for rel_path in files:
+            source = Path(repo_path) / rel_path
+            target = (files_dir / rel_path).resolve()
+            # Only files inside the repository can be published again
+            if not source.is_file() or not target.is_relative_to(files_dir.resolve()):
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, target)
+            stored.append(rel_path)
+        if not stored:
+            shutil.rmtree(artifact_dir, ignore_errors=True)
+            return None
+
+        artifact = Artifact(
+            repository=repository,
+            tree_sha=tree,
+            fingerprint=settings_fingerprint(),
+            files=stored,
+            status=status,
+            metrics=metrics or {},
+            created_at=datetime.now().isoformat(),
+            last_used=time.time(),
+            path=str(artifact_dir)
+        )
+        artifact_dir.mkdir(parents=True, exist_ok=True)
+        (artifact_dir / MANIFEST_FILE).write_text(artifact.model_dump_json())
+        self.evict()
+        return artifact
+
+    def restore(self, artifact: Artifact, repo_path: str) -> List[str]:
+        """Write an artifact's files into a checkout"""
+        files_dir = Path(artifact.path) / "files"
+        for rel_path in artifact.files:
+            target = Path(repo_path) / rel_path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(files_dir / rel_path, target)
+        return artifact.files
+
+    def evict(self) -> List[str]:
+        """Delete least recently used artifacts until the store fits its size limit"""
+        max_bytes = ARTIFACT_STORE_SETTINGS.get("max_bytes", 500 * 1024 * 1024)
+        entries = []
+        for manifest_path in self.root.glob(f"*/*/{MANIFEST_FILE}"):
+            artifact_dir = manifest_path.parent
+            try:
+                last_used = Artifact.model_validate_json(manifest_path.read_text()).last_used
+            except ValueError:
+                last_used = 0.0
+            size = sum(f.stat().st_size for f in artifact_dir.rglob('*') if f.is_file())
+            entries.append((last_used, size, artifact_dir))
+
+        total = sum(size for _, size, _ in entries)
+        evicted = []
+        for _, size, artifact_dir in sorted(entries, key=lambda entry: entry[0]):
+            if total <= max_bytes:
+                break
+            shutil.rmtree(artifact_dir, ignore_errors=True)
+            total -= size
+            evicted.append(str(artifact_dir))
+        return evicted
+
+def publish_from_store(repo_url: str, github_token: str, workspace: Path) -> Optional[dict]:
+    """Publish stored documentation if this exact tree was documented before.
+
+    Makes a shallow clone to find the tree SHA. Returns the publish result on
+    an exact hit, or None when the full pipeline has to run. The clone is
+    removed either way.
+    """
+    # Imported lazily: the git tools import agency_swarm
+    from .GitAgent.tools.git_tools import (
+        SafeFormatter,
+        commit_files,
+        open_or_update_pull_request,
+        repository_from_remote,
+        run_authenticated_git
+    )
+
+    repo_name = repo_url.rstrip('/').split('/')[-1].replace('.git', '')
+    repo_dir = Path(workspace) / f"{repo_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    repo_dir.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        run_authenticated_git(['clone', '--depth', '1', repo_url, str(repo_dir)], None, github_token)
+
+        store = ArtifactStore()
+        repository = repository_from_remote(str(repo_dir))
+        tree = tree_sha(str(repo_dir))
+        artifact = store.get(repository, tree)
+        if artifact is None:
+            return None
+
+        default_branch = subprocess.run(
+            ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
+            cwd=repo_dir,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+        branch_name = f"docs-update-{tree[:12]}"
+
+        # An earlier re-trigger may have pushed this branch already; build on it so the push fast-forwards
+        remote_branch = run_authenticated_git(
+            ['ls-remote', '--heads', 'origin', branch_name], str(repo_dir), github_token
+        ).stdout.strip()
+        if remote_branch:
+            run_authenticated_git(['fetch', '--depth', '1', 'origin', branch_name], str(repo_dir), github_token)
+        subprocess.run(
+            ['git', 'checkout', '-b', branch_name, 'FETCH_HEAD' if remote_branch else 'HEAD'],
+            cwd=repo_dir,
+            check=True,
+            capture_output=True,
+            text=True
+        )
+        files = store.restore(artifact, str(repo_dir))
+        committed = commit_files(str(repo_dir), files, "Update documentation")
+        if not committed and not remote_branch:
+            # The default branch already has exactly this documentation
+            return {"success": True, "committed": False, "pr_url": None, "artifact": artifact.path}
+        if committed:
+            run_authenticated_git(['push', '-u', 'origin', branch_name], str(repo_dir), github_token)
+
+        summary = {key: value for key, value in artifact.metrics.items() if isinstance(value, (int, float, str))}
+        pr, updated = open_or_update_pull_request(
+            github_token,
+            repository,
+            branch_name,
+            default_branch,
+            "Update documentation",
+            f"Documentation previously generated and reviewed for tree {tree}.\n\n"
+            f"Review metrics: {json.dumps(summary)}"
+        )
+        return {
+            "success": True,
+            "committed": committed,
+            "pr_url": pr.html_url,
+            "pr_number": pr.number,
+            "pr_updated": updated,
+            "status": pr.state,
+            "artifact": artifact.path
+        }
+    except subprocess.CalledProcessError as e:
+        return {"success": False, "error": f"Git error: {SafeFormatter.clean_sensitive_data(e.stderr or '')}"}
+    finally:
+        shutil.rmtree(repo_dir, ignore_errors=True)
@@ -0,0 +1,240 @@
+import json
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+from pydantic import BaseModel
+from .settings.settings import JOBS_DB, JOBS_DIR
+from .scheduler import BATCH, call_priority
+from .workspace import job_workspace
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATUSES = {SUCCEEDED, FAILED, CANCELLED}
+
+class Job(BaseModel):
+    """A documentation job as stored in the queue"""
+    id: str
+    repo_url: str
+    review_iterations: int
+    priority: int = BATCH
+    status: str
+    workspace: str
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    result: Optional[str] = None
+    error: Optional[str] = None
+
+def build_prompt(repo_url: str, review_iterations: int, workspace: Path) -> str:
+    """Prompt that drives the agency through a full documentation run"""
+    return f"""Please analyze and document the repository at {repo_url}.
+
+        Process:
+        1. Generate documentation:
+           - Analyze repository structure and content
+           - Create comprehensive documentation
+           - Focus on clarity and completeness
+           - Include code examples where relevant
+           - Document architecture and design decisions
+
+        2. Review and improve:
+           - Review documentation quality and coverage
+           - Identify any gaps or unclear sections
+           - Provide specific improvement recommendations
+           - Iterate up to {review_iterations} times until quality standards are met
+
+        3. Quality Standards:
+           - Documentation is complete and accurate
+           - All major components are documented
+           - Examples are clear and working
+           - Architecture is well-explained
+           - Setup instructions are complete
+           - API documentation is comprehensive
+
+        Note: Git operations will be handled automatically by the GitAgent.
+        Working directory: {workspace} (clone the repository into this workspace)
+        Documentation output: the docs/ directory inside the cloned repository
+        """
+
+class JobQueue:
+    """Persistent priority job queue backed by SQLite.
+
+    Every operation opens its own connection, so the queue can be shared by
+    the HTTP handler threads and the worker threads.
+    """
+
+    def __init__(self, db_path: Path = JOBS_DB):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    repo_url TEXT NOT NULL,
+                    review_iterations INTEGER NOT NULL,
+                    priority INTEGER NOT NULL DEFAULT 1,
+                    status TEXT NOT NULL,
+                    workspace TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    finished_at TEXT,
+                    result TEXT,
+                    error TEXT
+                );
+                CREATE TABLE IF NOT EXISTS messages (
+                    job_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    message TEXT NOT NULL,
+                    PRIMARY KEY (job_id, seq)
+                );
+            """)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "priority" not in columns:
+                conn.execute(f"ALTER TABLE jobs ADD COLUMN priority INTEGER NOT NULL DEFAULT {BATCH}")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def submit(self, repo_url: str, review_iterations: int = 3, priority: int = BATCH) -> Job:
+        job_id = uuid.uuid4().hex
+        job = Job(
+            id=job_id,
+            repo_url=repo_url,
+            review_iterations=review_iterations,
+            priority=priority,
+            status=QUEUED,
+            workspace=str(Path(JOBS_DIR) / job_id),
+            created_at=datetime.now().isoformat()
+        )
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, repo_url, review_iterations, priority, status, workspace, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job.id, job.repo_url, job.review_iterations, job.priority, job.status,
+                 job.workspace, job.created_at)
+            )
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job(**dict(row)) if row else None
+
+    def list(self, limit: int = 50) -> List[Job]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [Job(**dict(row)) for row in rows]
+
+    def claim(self) -> Optional[Job]:
+        """Atomically take the next queued job (highest priority, then oldest) and mark it running"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? ORDER BY priority, created_at LIMIT 1", (QUEUED,)
+                ).fetchone()
+                if row:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, started_at = ? WHERE id = ?",
+                        (RUNNING, datetime.now().isoformat(), row["id"])
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return self.get(row["id"]) if row else None
+
+    def finish(self, job_id: str, status: str, result: Optional[str] = None,
+               error: Optional[str] = None) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ? "
+                "WHERE id = ? AND status != ?",
+                (status, datetime.now().isoformat(), result, error, job_id, CANCELLED)
+            )
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job. Running jobs stop at their next message."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status IN (?, ?)",
+                (CANCELLED, datetime.now().isoformat(), job_id, QUEUED, RUNNING)
+            )
+        return cursor.rowcount > 0
+
+    def is_cancelled(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        return job is not None and job.status == CANCELLED
+
+    def requeue_interrupted(self) -> int:
+        """Put jobs left running by a previous server process back in the queue"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?", (QUEUED, RUNNING)
+            )
+        return cursor.rowcount
+
+    def add_message(self, job_id: str, message: dict) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO messages (job_id, seq, message) VALUES "
+                "(?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM messages WHERE job_id = ?), ?)",
+                (job_id, job_id, json.dumps(message))
+            )
+
+    def messages(self, job_id: str, after: int = 0) -> List[dict]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT seq, message FROM messages WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after)
+            ).fetchall()
+        return [{"seq": row["seq"], **json.loads(row["message"])} for row in rows]
+
+def run_job(agency, job: Job, queue: JobQueue, clean=lambda text: text) -> None:
+    """Run a job to completion on the given agency, recording its messages.
+
+    Clones and generated documentation are kept inside the job's workspace.
+    `clean` is applied to everything recorded so tokens never reach the queue.
+    """
+    workspace = Path(job.workspace)
+    workspace.mkdir(parents=True, exist_ok=True)
+
+    with call_priority(job.priority), job_workspace(workspace):
+        _run_job(agency, job, queue, clean, workspace)
+
+def _run_job(agency, job: Job, queue: JobQueue, clean, workspace: Path) -> None:
+    result_gen = agency.get_completion(
+        message=clean(build_prompt(job.repo_url, job.review_iterations, workspace)),
+        yield_messages=True
+    )
+    try:
+        while True:
+            if queue.is_cancelled(job.id):
+                result_gen.close()
+                return
+            try:
+                message = next(result_gen)
+            except StopIteration as e:
+                queue.finish(job.id, SUCCEEDED, result=clean(str(e.value)))
+                return
+            queue.add_message(job.id, {
+                "sender": getattr(message, "sender_name", None),
+                "receiver": getattr(message, "receiver_name", None),
+                "content": clean(str(getattr(message, "content", message)))
+            })
+    except Exception as e:
+        queue.finish(job.id, FAILED, error=clean(str(e)))
@@ -0,0 +1,264 @@
+import contextvars
+import heapq
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+import httpx
+from .settings.settings import AGENT_SETTINGS, OPENAI_API_KEY, OPENAI_BASE_URL, SCHEDULER_SETTINGS
+
+INTERACTIVE = 0
+BATCH = 1
+PRIORITIES = {"interactive": INTERACTIVE, "batch": BATCH}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Requests that start model work: creating a run (also with a new thread) or a chat completion
+MODEL_CALL_PATH = re.compile(r"/(?:threads/[^/]+/runs|threads/runs|chat/completions)$")
+
+# Priority of model calls made from the current thread or task
+current_priority = contextvars.ContextVar("current_priority", default=INTERACTIVE)
+
+@contextmanager
+def call_priority(priority: int):
+    """Run model calls inside the block at the given priority"""
+    token = current_priority.set(priority)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+class TokenBucket:
+    """Bucket holding up to `per_minute` units, refilled continuously"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.available = self.capacity
+        self.updated = time.monotonic()
+
+    def resize(self, per_minute: float) -> None:
+        """Change the budget, keeping what is available up to the new capacity"""
+        self._refill()
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.available = min(self.available, self.capacity)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 if they are now)"""
+        self._refill()
+        # A request larger than the whole bucket waits for a full bucket
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.available) / self.rate)
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.available -= min(amount, self.capacity)
+
+class ModelCallScheduler:
+    """Enforces requests- and tokens-per-minute budgets across every model call in the process.
+
+    Callers wait in a single priority queue, so interactive calls are admitted
+    ahead of batch calls and calls of equal priority go first-come first-served.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        # Fraction of the budgets not reserved for worker processes
+        self.share = 1.0
+        self._condition = threading.Condition()
+        self._waiting = []
+        self._order = itertools.count()
+        self._stats = {"calls": 0, "retries": 0, "total_wait": 0.0, "max_wait": 0.0}
+
+    def acquire(self, tokens: int, priority: Optional[int] = None) -> float:
+        """Block until the call may be made; return the time spent waiting"""
+        priority = current_priority.get() if priority is None else priority
+        entry = (priority, next(self._order))
+        started = time.monotonic()
+        with self._condition:
+            heapq.heappush(self._waiting, entry)
+            while True:
+                if self._waiting[0] == entry:
+                    delay = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+                    if delay == 0:
+                        break
+                    self._condition.wait(delay)
+                else:
+                    self._condition.wait()
+            heapq.heappop(self._waiting)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+
+            waited = time.monotonic() - started
+            self._stats["calls"] += 1
+            self._stats["total_wait"] += waited
+            self._stats["max_wait"] = max(self._stats["max_wait"], waited)
+            self._condition.notify_all()
+        return waited
+
+    def _set_share(self, share: float) -> None:
+        self.share = share
+        # Keep a sliver so calls made here while everything is reserved still get through
+        self.requests.resize(max(self.requests_per_minute * share, 1.0))
+        self.tokens.resize(max(self.tokens_per_minute * share, 1.0))
+
+    @contextmanager
+    def reserve(self, fraction: float):
+        """Hand `fraction` of the current budgets to worker processes for the block.
+
+        Yields the reserved share of this scheduler's full budgets; the workers
+        split it between their own schedulers, so the process and its workers
+        together stay within the configured limits.
+        """
+        with self._condition:
+            reserved = self.share * fraction
+            self._set_share(self.share - reserved)
+        try:
+            yield reserved
+        finally:
+            with self._condition:
+                self._set_share(self.share + reserved)
+                self._condition.notify_all()
+
+    def record_retry(self) -> None:
+        with self._condition:
+            self._stats["retries"] += 1
+
+    def metrics(self) -> Dict[str, float]:
+        with self._condition:
+            calls = self._stats["calls"]
+            return {
+                "calls": calls,
+                "retries": self._stats["retries"],
+                "queued": len(self._waiting),
+                "mean_wait_seconds": round(self._stats["total_wait"] / calls, 3) if calls else 0.0,
+                "max_wait_seconds": round(self._stats["max_wait"], 3),
+            }
+
+def is_model_call(request: httpx.Request) -> bool:
+    """Whether a request starts model work; run polls and other reads do not"""
+    return request.method == "POST" and bool(MODEL_CALL_PATH.search(request.url.path))
+
+def estimate_tokens(request: httpx.Request) -> int:
+    """Token cost of a model call: its prompt budget plus its completion limit.
+
+    A run's prompt is the server-side thread, not the request body, so runs are
+    charged their max_prompt_tokens (AGENT_SETTINGS by default). Chat
+    completions are charged their body characters / 4.
+    """
+    body = request.read()
+    try:
+        payload = json.loads(body) if body else {}
+    except ValueError:
+        payload = {}
+    if not isinstance(payload, dict):
+        payload = {}
+    completion = (
+        payload.get("max_completion_tokens")
+        or payload.get("max_tokens")
+        or SCHEDULER_SETTINGS.get("default_completion_tokens", 4000)
+    )
+    if request.url.path.endswith("/runs"):
+        prompt = payload.get("max_prompt_tokens") or AGENT_SETTINGS.get("max_prompt_tokens", 25000)
+    else:
+        prompt = len(body) // 4
+    return int(prompt) + int(completion)
+
+class ScheduledTransport(httpx.BaseTransport):
+    """httpx transport that admits requests through the scheduler and retries rate limits"""
+
+    def __init__(self, scheduler: ModelCallScheduler, transport: Optional[httpx.BaseTransport] = None):
+        self.scheduler = scheduler
+        self.transport = transport or httpx.HTTPTransport()
+        self.max_retries = SCHEDULER_SETTINGS.get("max_retries", 5)
+        self.backoff_base = SCHEDULER_SETTINGS.get("backoff_base", 1.0)
+        self.backoff_max = SCHEDULER_SETTINGS.get("backoff_max", 60.0)
+
+    def _backoff(self, attempt: int, response: httpx.Response) -> float:
+        retry_after = response.headers.get("retry-after")
+        try:
+            if retry_after:
+                return min(float(retry_after), self.backoff_max)
+        except ValueError:
+            pass
+        # Full jitter: spread retries from concurrent jobs over the backoff window
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        # Only model calls are admitted and counted; run polls go straight through
+        model_call = is_model_call(request)
+        tokens = estimate_tokens(request) if model_call else 0
+        attempt = 0
+        while True:
+            if model_call:
+                self.scheduler.acquire(tokens)
+            response = self.transport.handle_request(request)
+            if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                return response
+            delay = self._backoff(attempt, response)
+            response.close()
+            if model_call:
+                self.scheduler.record_retry()
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        self.transport.close()
+
+_scheduler = None
+_scheduler_installed = False
+_scheduler_lock = threading.Lock()
+
+def get_scheduler(budget_share: float = 1.0) -> ModelCallScheduler:
+    """The process-wide scheduler shared by all agents and jobs.
+
+    `budget_share` only applies when the scheduler is first created; worker
+    processes use it to split the configured budgets between them.
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = ModelCallScheduler(
+                SCHEDULER_SETTINGS.get("requests_per_minute", 500) * budget_share,
+                SCHEDULER_SETTINGS.get("tokens_per_minute", 150000) * budget_share
+            )
+        return _scheduler
+
+def build_openai_client(base_url: Optional[str] = None, budget_share: float = 1.0):
+    """OpenAI client whose calls all go through the shared scheduler.
+
+    Set OPENAI_BASE_URL (or pass base_url) to point it at a local fake endpoint.
+    """
+    import openai
+
+    return openai.OpenAI(
+        api_key=OPENAI_API_KEY,
+        base_url=base_url or OPENAI_BASE_URL,
+        # Retries are done by the scheduler so they are counted against the budgets
+        max_retries=0,
+        http_client=httpx.Client(
+            transport=ScheduledTransport(get_scheduler(budget_share)),
+            timeout=SCHEDULER_SETTINGS.get("timeout", 600.0)
+        )
+    )
+
+def install_scheduler(budget_share: float = 1.0) -> None:
+    """Route every agency_swarm model call in this process through the scheduler"""
+    from agency_swarm import set_openai_client
+
+    global _scheduler_installed
+    if _scheduler_installed:
+        return
+    set_openai_client(build_openai_client(budget_share=budget_share))
+    _scheduler_installed = True
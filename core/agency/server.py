@@ -0,0 +1,171 @@
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+from urllib.parse import parse_qs, urlparse
+from .agency import create_agency
+from .jobs import JobQueue, FAILED, FINISHED_STATUSES, run_job
+from .scheduler import PRIORITIES, get_scheduler
+from .settings.settings import SERVER_SETTINGS
+
+JOB_PATH = re.compile(r"^/jobs/([0-9a-f]{32})(/messages|/cancel)?$")
+
+class Worker(threading.Thread):
+    """Runs queued jobs on a warm agency.
+
+    A fresh agency is built after each job so the next job starts with clean
+    threads but without paying for construction. Errors fail the job at hand
+    and back off, but never stop the worker.
+    """
+
+    def __init__(self, queue: JobQueue, clean: Callable[[str], str], poll_interval: float):
+        super().__init__(daemon=True)
+        self.queue = queue
+        self.clean = clean
+        self.poll_interval = poll_interval
+        self.max_backoff = SERVER_SETTINGS.get("max_backoff", 60.0)
+
+    def run(self) -> None:
+        agency = None
+        failures = 0
+        while True:
+            job = None
+            try:
+                # Built before claiming, so no job waits on a failing construction
+                if agency is None:
+                    agency = create_agency()
+                job = self.queue.claim()
+                if job is None:
+                    time.sleep(self.poll_interval)
+                    continue
+                # A used agency is never reused, even when the job failed part-way
+                used, agency = agency, None
+                run_job(used, job, self.queue, self.clean)
+                failures = 0
+            except Exception as e:
+                error = self.clean(str(e))
+                print(f"Worker error: {error}")
+                if job is not None:
+                    self._fail(job.id, error)
+                failures += 1
+                time.sleep(min(self.poll_interval * 2 ** failures, self.max_backoff))
+
+    def _fail(self, job_id: str, error: str) -> None:
+        try:
+            self.queue.finish(job_id, FAILED, error=error)
+        except Exception as e:
+            # Left running; requeue_interrupted picks it up on the next start
+            print(f"Could not mark job {job_id} as failed: {self.clean(str(e))}")
+
+def make_handler(queue: JobQueue, poll_interval: float):
+    class JobRequestHandler(BaseHTTPRequestHandler):
+        """Local HTTP API: submit, poll, stream and cancel documentation jobs"""
+
+        def _send_json(self, status: int, body) -> None:
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _read_json(self) -> Optional[dict]:
+            length = int(self.headers.get("Content-Length", 0))
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                return None
+            return body if isinstance(body, dict) else None
+
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            if url.path == "/jobs":
+                self._send_json(200, [job.model_dump() for job in queue.list()])
+                return
+            if url.path == "/metrics":
+                self._send_json(200, get_scheduler().metrics())
+                return
+
+            match = JOB_PATH.match(url.path)
+            job = queue.get(match.group(1)) if match and match.group(2) != "/cancel" else None
+            if job is None:
+                self._send_json(404, {"error": "Job not found"})
+            elif match.group(2) == "/messages":
+                try:
+                    after = int(parse_qs(url.query).get("after", ["0"])[0])
+                except ValueError:
+                    self._send_json(400, {"error": "after must be an integer"})
+                    return
+                self._stream_messages(job.id, after)
+            else:
+                self._send_json(200, job.model_dump())
+
+        def _stream_messages(self, job_id: str, after: int) -> None:
+            """Stream messages as newline-delimited JSON until the job finishes"""
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            try:
+                while True:
+                    for message in queue.messages(job_id, after):
+                        self.wfile.write((json.dumps(message) + "\n").encode())
+                        after = message["seq"]
+                    self.wfile.flush()
+                    job = queue.get(job_id)
+                    if job.status in FINISHED_STATUSES and not queue.messages(job_id, after):
+                        self.wfile.write((json.dumps({"status": job.status}) + "\n").encode())
+                        return
+                    time.sleep(poll_interval)
+            except (BrokenPipeError, ConnectionResetError):
+                return
+
+        def do_POST(self) -> None:
+            url = urlparse(self.path)
+            if url.path == "/jobs":
+                body = self._read_json()
+                if not body or not str(body.get("repo_url", "")).startswith(("http://", "https://")):
+                    self._send_json(400, {"error": "repo_url is required"})
+                    return
+                priority = PRIORITIES.get(body.get("priority", "batch"))
+                if priority is None:
+                    self._send_json(400, {"error": f"priority must be one of {sorted(PRIORITIES)}"})
+                    return
+                try:
+                    review_iterations = int(body.get("review_iterations", 3))
+                except (TypeError, ValueError):
+                    self._send_json(400, {"error": "review_iterations must be an integer"})
+                    return
+                job = queue.submit(body["repo_url"], review_iterations, priority)
+                self._send_json(202, job.model_dump())
+                return
+
+            match = JOB_PATH.match(url.path)
+            if not match or match.group(2) != "/cancel":
+                self._send_json(404, {"error": "Not found"})
+            elif queue.cancel(match.group(1)):
+                self._send_json(200, queue.get(match.group(1)).model_dump())
+            else:
+                self._send_json(409, {"error": "Job not found or already finished"})
+
+    return JobRequestHandler
+
+def serve(host: Optional[str] = None, port: Optional[int] = None, workers: Optional[int] = None,
+          clean: Callable[[str], str] = lambda text: text) -> None:
+    """Start the workers and serve the job API until interrupted"""
+    host = host or SERVER_SETTINGS.get("host", "127.0.0.1")
+    port = port or SERVER_SETTINGS.get("port", 8765)
+    workers = workers or SERVER_SETTINGS.get("workers", 2)
+    poll_interval = SERVER_SETTINGS.get("poll_interval", 1.0)
+
+    queue = JobQueue()
+    queue.requeue_interrupted()
+    for _ in range(workers):
+        Worker(queue, clean, poll_interval).start()
+
+    server = ThreadingHTTPServer((host, port), make_handler(queue, poll_interval))
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
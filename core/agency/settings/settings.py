@@ -12,6 +12,7 @@ REVIEW_AGENT_ID = os.getenv("REVIEW_AGENT_ID")  # Added Review Agent ID
 
 # OpenAI Configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")  # e.g. a local fake endpoint for testing
 DEFAULT_MODEL = "gpt-4-1106-preview"
 
 # GitHub Configuration
@@ -19,7 +20,11 @@ GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 
 # File paths
 FILES_DIR = BASE_DIR / "files"
-DOCS_OUTPUT_DIR = FILES_DIR / "docs"
+DOCS_OUTPUT_DIR = Path("docs")  # relative to the root of the documented repository
+CACHE_DIR = FILES_DIR / ".cache"
+JOBS_DIR = FILES_DIR / "jobs"  # one workspace per server job
+JOBS_DB = FILES_DIR / "jobs.db"
+ARTIFACTS_DIR = FILES_DIR / "artifacts"  # reviewed docs keyed by repository and tree SHA
 
 # Documentation settings
 DOCS_INDEX_FILE = "index.md"
@@ -30,6 +35,9 @@ IGNORE_DIRS = {
     '.git', '__pycache__', 'node_modules', 
     'venv', '.venv', 'build', 'dist'
 }
+# Test and sample code: not part of the documented API and never a sub-project
+TEST_DIRS = {'test', 'tests', '__tests__', 'fixtures'}
+EXAMPLE_DIRS = {'example', 'examples', 'sample', 'samples'}
 
 DEPENDENCY_FILES = {
     'requirements.txt': 'python',
@@ -37,7 +45,79 @@ DEPENDENCY_FILES = {
     'Gemfile': 'ruby',
     'pom.xml': 'java',
     'build.gradle': 'java',
-    'Cargo.toml': 'rust'
+    'Cargo.toml': 'rust',
+    'pyproject.toml': 'python',
+    'setup.py': 'python',
+    'go.mod': 'go'
+}
+
+# Large File Settings (files over the limits are sampled via mmap instead of read in full)
+LARGE_FILE_SETTINGS = {
+    "max_full_read_bytes": 1_000_000,  # always sampled above this size
+    "inspect_bytes": 65_536,  # above this size, sampled if minified or generated
+    "minified_line_length": 1000,
+    "head_bytes": 4096,
+    "tail_bytes": 2048,
+    "sample_count": 5,  # evenly spaced samples between head and tail
+    "sample_bytes": 1024,
+}
+
+# Monorepo Sharding Settings
+SHARD_SETTINGS = {
+    "min_shards": 2,  # below this a repository is documented as a single project
+    "max_workers": 4,
+    "max_prompt_tokens": 25000,  # budget for each shard's conversation
+    "budget_share": 0.5,  # share of the process's remaining rate limits reserved for the shard workers
+}
+
+# Fan-out Settings (GenerateDocumentationTool with fan_out=True)
+FANOUT_SETTINGS = {
+    "module_depth": 1,  # path components that make up a module, e.g. 1 -> "src"; larger modules are split further
+    "max_parallel_calls": 4,
+    "max_module_chars": 60000,  # source text per module page; bigger modules are split into subdirectories
+    "max_tokens": 2000,  # completion limit per page
+}
+
+# Import Graph Settings (used to prioritise files during analysis)
+IMPORT_GRAPH_SETTINGS = {
+    "damping": 0.85,
+    "iterations": 30,
+    "top_n": 20,  # length of the fan-in and centrality rankings in the analysis
+    "cache_max_bytes": 50 * 1024 * 1024,  # least recently used graphs are evicted above this
+}
+
+# Review Thresholds (docs meeting all of them are approved without another LLM pass)
+REVIEW_THRESHOLDS = {
+    "min_symbol_coverage": 0.8,
+    "max_broken_links": 0,
+    "max_invalid_code_blocks": 0,
+    "min_words_per_page": 50,  # shorter pages are only suggested for expansion
+    "required_sections": ["setup", "api"],
+}
+
+# Model Call Scheduler Settings (shared by all agents and jobs in the process)
+SCHEDULER_SETTINGS = {
+    "requests_per_minute": 500,
+    "tokens_per_minute": 150000,
+    "default_completion_tokens": 4000,  # charged for model calls that set no completion limit
+    "max_retries": 5,  # retries on 429 and 5xx responses
+    "backoff_base": 1.0,  # seconds; doubled on every retry, with full jitter
+    "backoff_max": 60.0,
+    "timeout": 600.0,
+}
+
+# Artifact Store Settings
+ARTIFACT_STORE_SETTINGS = {
+    "max_bytes": 500 * 1024 * 1024,  # least recently used artifacts are evicted above this
+}
+
+# Server Settings (python main.py serve)
+SERVER_SETTINGS = {
+    "host": "127.0.0.1",
+    "port": 8765,
+    "workers": 2,
+    "poll_interval": 1.0,  # seconds between queue and message polls
+    "max_backoff": 60.0,  # seconds a worker waits at most after repeated errors
 }
 
 # Agent Settings (shared configuration for agency-swarm)
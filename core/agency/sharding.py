@@ -0,0 +1,189 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+from .scheduler import get_scheduler, install_scheduler
+from .settings.settings import (
+    DEPENDENCY_FILES,
+    IGNORE_DIRS,
+    DOCS_OUTPUT_DIR,
+    DOCS_INDEX_FILE,
+    README_FILE,
+    SHARD_SETTINGS,
+    TEST_DIRS,
+    EXAMPLE_DIRS
+)
+
+# Files that make a directory worth documenting outside any package
+SOURCE_SUFFIXES = {
+    '.py', '.js', '.jsx', '.mjs', '.cjs', '.ts', '.tsx', '.go', '.rs', '.java',
+    '.kt', '.rb', '.php', '.c', '.h', '.cc', '.cpp', '.hpp', '.cs', '.swift', '.scala'
+}
+ROOT_SHARD_NAME = "root"
+SHARD_LINKS_MARKER = "<!-- shard-links -->"
+
+class Shard(BaseModel):
+    """A sub-project of a monorepo, rooted at a dependency manifest"""
+    name: str
+    path: str
+    language: str
+    manifest: str
+    exclude: List[str] = []
+
+def detect_shards(repo_path: Path) -> List[Shard]:
+    """Find sub-project roots by looking for the manifests in DEPENDENCY_FILES.
+
+    Manifests nested inside a shard belong to that shard, and manifests of
+    tests, fixtures and examples are not sub-projects. Source files outside
+    every shard make up a root shard that excludes the others, so code at the
+    top of the repository is not lost.
+    """
+    repo_path = Path(repo_path)
+    shards = []
+    root_manifest = None
+    has_root_sources = False
+    for root, dirs, files in os.walk(repo_path):
+        rel_root = Path(root).relative_to(repo_path)
+        dirs[:] = sorted(
+            d for d in dirs
+            if not d.startswith('.') and d not in IGNORE_DIRS
+            and d not in TEST_DIRS and d not in EXAMPLE_DIRS
+            and rel_root / d != Path(DOCS_OUTPUT_DIR)
+        )
+
+        manifest = next((f for f in sorted(files) if f in DEPENDENCY_FILES), None)
+        if rel_root == Path('.') or manifest is None:
+            if rel_root == Path('.'):
+                root_manifest = manifest
+            has_root_sources = has_root_sources or any(
+                Path(f).suffix in SOURCE_SUFFIXES for f in files
+            )
+            continue
+
+        shards.append(Shard(
+            name='-'.join(rel_root.parts),
+            path=rel_root.as_posix(),
+            language=DEPENDENCY_FILES[manifest],
+            manifest=manifest
+        ))
+        # Don't descend into a shard looking for more shards
+        dirs[:] = []
+
+    if shards and has_root_sources:
+        shards.insert(0, Shard(
+            name=ROOT_SHARD_NAME,
+            path='.',
+            language=DEPENDENCY_FILES.get(root_manifest, 'mixed'),
+            manifest=root_manifest or '',
+            exclude=[shard.path for shard in shards] + [Path(DOCS_OUTPUT_DIR).as_posix()]
+        ))
+    return shards
+
+def document_shard(repo_path: str, shard: dict, docs_dir: str, max_prompt_tokens: int,
+                   budget_share: float = 1.0) -> dict:
+    """Document a single shard in its own agency conversation.
+
+    Runs in a worker process, so the agency is created here rather than
+    passed in.
+    """
+    # Imported lazily: the agent module imports the tools that use this module
+    from agency_swarm import Agency
+    from .DocuAgent.docuAgent import DocuAgent
+
+    shard = Shard(**shard)
+    shard_path = Path(repo_path) / shard.path
+    shard_docs_dir = Path(docs_dir) / shard.name
+    try:
+        # Each worker process has its own scheduler, so split the budgets between them
+        install_scheduler(budget_share)
+        agency = Agency(
+            [DocuAgent()],
+            shared_instructions=os.path.join(os.path.dirname(__file__), 'agency-manifesto.md'),
+            max_prompt_tokens=max_prompt_tokens
+        )
+        result = agency.get_completion(
+            message=f"""Please analyze and document the {shard.language} sub-project at {shard_path}.
+
+            This is one package of a larger monorepo; only document this package.
+            - Run AnalyzeRepositoryTool with repo_path={shard_path} and exclude_dirs={shard.exclude}
+            - Run GenerateDocumentationTool with repo_path={shard_path}, docs_dir={shard_docs_dir}
+              and readme_path={shard_docs_dir / README_FILE}, so the package's own README is left alone
+            - The entry page must be {DOCS_INDEX_FILE}
+            """
+        )
+        return {"shard": shard.name, "success": True, "result": str(result)}
+    except Exception as e:
+        return {"shard": shard.name, "success": False, "error": str(e)}
+
+def merge_shard_indexes(docs_dir: Path, shards: List[Shard], results: Dict[str, dict]) -> Path:
+    """Write the top-level index linking every shard, and cross-link the shard indexes"""
+    docs_dir = Path(docs_dir)
+    lines = [
+        "# Packages",
+        "",
+        "| Package | Path | Language | Status |",
+        "| --- | --- | --- | --- |"
+    ]
+    for shard in shards:
+        status = "documented" if results.get(shard.name, {}).get("success") else "failed"
+        lines.append(
+            f"| [{shard.name}]({shard.name}/{DOCS_INDEX_FILE}) | `{shard.path}` "
+            f"| {shard.language} | {status} |"
+        )
+
+    index_path = docs_dir / DOCS_INDEX_FILE
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    index_path.write_text('\n'.join(lines) + '\n')
+
+    for shard in shards:
+        shard_index = docs_dir / shard.name / DOCS_INDEX_FILE
+        if not shard_index.exists():
+            continue
+        # Replace the links from a previous run rather than appending more
+        content = shard_index.read_text().split(SHARD_LINKS_MARKER)[0].rstrip()
+        see_also = [SHARD_LINKS_MARKER, "## See also", "", f"- [All packages](../{DOCS_INDEX_FILE})"]
+        see_also += [
+            f"- [{other.name}](../{other.name}/{DOCS_INDEX_FILE})"
+            for other in shards if other.name != shard.name
+        ]
+        shard_index.write_text(content + '\n\n' + '\n'.join(see_also) + '\n')
+
+    return index_path
+
+def document_shards(repo_path: Path, shards: List[Shard],
+                    max_workers: Optional[int] = None) -> Dict[str, dict]:
+    """Document every shard in parallel worker processes and merge the results"""
+    repo_path = Path(repo_path)
+    docs_dir = repo_path / DOCS_OUTPUT_DIR
+    max_workers = max_workers or SHARD_SETTINGS.get("max_workers", 4)
+    max_prompt_tokens = SHARD_SETTINGS.get("max_prompt_tokens", 25000)
+
+    workers = min(max_workers, len(shards))
+    results = {}
+    # Spawn rather than fork: a forked worker inherits the parent's installed
+    # full-budget scheduler and its client, and install_scheduler would keep them
+    context = multiprocessing.get_context("spawn")
+    # The workers' budgets come out of this process's scheduler while they run.
+    # The split is fixed for the pool's lifetime, so a worker can't use budget
+    # that other jobs in this process leave idle.
+    reservation = get_scheduler().reserve(SHARD_SETTINGS.get("budget_share", 0.5))
+    with reservation as reserved, ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = [
+            executor.submit(
+                document_shard,
+                str(repo_path),
+                shard.model_dump(),
+                str(docs_dir),
+                max_prompt_tokens,
+                reserved / workers
+            )
+            for shard in shards
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result["shard"]] = result
+
+    merge_shard_indexes(docs_dir, shards, results)
+    return results
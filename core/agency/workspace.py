@@ -0,0 +1,23 @@
+import contextvars
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+# Workspace of the job running in the current thread or task; None outside jobs
+current_workspace = contextvars.ContextVar("current_workspace", default=None)
+
+@contextmanager
+def job_workspace(workspace: Path):
+    """Keep the files written by tools inside the block in the given workspace"""
+    token = current_workspace.set(Path(workspace).resolve())
+    try:
+        yield
+    finally:
+        current_workspace.reset(token)
+
+def outside_workspace(path: Path) -> Optional[Path]:
+    """The current job's workspace if `path` is outside it, else None"""
+    workspace = current_workspace.get()
+    if workspace is None or Path(path).resolve().is_relative_to(workspace):
+        return None
+    return workspace
@@ -8,14 +8,19 @@ import typer
 from pathlib import Path
 from datetime import datetime
 from rich.console import Console
+from openai import RateLimitError
 from core.agency.agency import create_agency
+from core.agency.jobs import build_prompt
+from core.agency.server import serve as serve_jobs
+from core.agency.artifact_store import publish_from_store
 from core.agency.settings.settings import (
     OPENAI_API_KEY,
     GITHUB_TOKEN,
     DEFAULT_MODEL,
     AGENT_SETTINGS,
-    DOCS_OUTPUT_DIR,
-    FILES_DIR
+    FILES_DIR,
+    SERVER_SETTINGS,
+    SCHEDULER_SETTINGS
 )
 
 console = Console()
@@ -30,23 +35,8 @@ class SafeFormatter:
             text = text.replace(token, "***")
         return text
 
-@app.command()
-def generate_docs(
-    repo_url: str = typer.Argument(..., help="GitHub repository URL"),
-    github_token: Optional[str] = typer.Option(
-        None,
-        help="GitHub token. If not provided, will use GITHUB_TOKEN from settings or environment"
-    ),
-    review_iterations: int = typer.Option(
-        3,
-        help="Maximum number of review iterations"
-    )
-) -> None:
-    """Generate and review documentation for a GitHub repository"""
-    # Ensure settings directory exists
-    Path(FILES_DIR).mkdir(parents=True, exist_ok=True)
-    Path(DOCS_OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
-
+def check_credentials(github_token: Optional[str] = None) -> str:
+    """Exit unless the OpenAI key and GitHub token are configured; return the token"""
     # Check OpenAI API key
     api_key = OPENAI_API_KEY or os.getenv("OPENAI_API_KEY")
     if not api_key:
@@ -64,6 +54,50 @@ def generate_docs(
     if token == "your-github-token":
         typer.echo("Error: GITHUB_TOKEN not configured. Please set your actual GitHub token")
         raise typer.Exit(1)
+    return token
+
+@app.command()
+def generate_docs(
+    repo_url: str = typer.Argument(..., help="GitHub repository URL"),
+    github_token: Optional[str] = typer.Option(
+        None,
+        help="GitHub token. If not provided, will use GITHUB_TOKEN from settings or environment"
+    ),
+    review_iterations: int = typer.Option(
+        3,
+        help="Maximum number of review iterations"
+    ),
+    reuse_artifacts: bool = typer.Option(
+        True,
+        help="Publish stored documentation when this exact tree was documented before"
+    )
+) -> None:
+    """Generate and review documentation for a GitHub repository"""
+    # Ensure settings directory exists
+    Path(FILES_DIR).mkdir(parents=True, exist_ok=True)
+
+    token = check_credentials(github_token)
+
+    if reuse_artifacts:
+        console.print("[bold blue]Checking for stored documentation...[/]")
+        try:
+            result = publish_from_store(repo_url, token, FILES_DIR)
+        except Exception as e:
+            # The store is only a shortcut; fall back to the full pipeline
+            console.print(f"[yellow]Artifact lookup failed:[/] {SafeFormatter.clean_sensitive_data(str(e))}")
+            result = None
+        if result is not None and not result.get("success"):
+            console.print(
+                f"[yellow]Publishing stored documentation failed, running the full pipeline:[/] "
+                f"{SafeFormatter.clean_sensitive_data(str(result.get('error')))}"
+            )
+        elif result is not None:
+            if result["pr_url"]:
+                console.print("\n[bold green]Published stored documentation for this tree![/]")
+                console.print(f"[bold]Pull request:[/] {result['pr_url']}")
+            else:
+                console.print("\n[bold green]The default branch already has the stored documentation for this tree.[/]")
+            return
 
     # Create agency using settings
     console.print("[bold blue]Creating documentation agency...[/]")
@@ -73,34 +107,7 @@ def generate_docs(
         # Start the documentation process with review iterations
         console.print(f"[bold green]Starting documentation process for {repo_url}...[/]")
         
-        prompt = f"""Please analyze and document the repository at {repo_url}.
-
-        Process:
-        1. Generate documentation:
-           - Analyze repository structure and content
-           - Create comprehensive documentation
-           - Focus on clarity and completeness
-           - Include code examples where relevant
-           - Document architecture and design decisions
-           
-        2. Review and improve:
-           - Review documentation quality and coverage
-           - Identify any gaps or unclear sections
-           - Provide specific improvement recommendations
-           - Iterate up to {review_iterations} times until quality standards are met
-
-        3. Quality Standards:
-           - Documentation is complete and accurate
-           - All major components are documented
-           - Examples are clear and working
-           - Architecture is well-explained
-           - Setup instructions are complete
-           - API documentation is comprehensive
-           
-        Note: Git operations will be handled automatically by the GitAgent.
-        Working directory: {FILES_DIR}
-        Documentation output: {DOCS_OUTPUT_DIR}
-        """
+        prompt = build_prompt(repo_url, review_iterations, FILES_DIR)
 
         # Get messages with yield for progress tracking
         result_gen = agency.get_completion(
@@ -123,11 +130,35 @@ def generate_docs(
             console.print(f"\n[bold green]Documentation generated and reviewed successfully![/]")
             console.print(f"[bold]Result:[/] {result}")
         
+    except RateLimitError as e:
+        error_msg = SafeFormatter.clean_sensitive_data(str(e))
+        console.print(f"[bold red]Rate limited by the model API after {SCHEDULER_SETTINGS['max_retries']} retries:[/] {error_msg}")
+        console.print("Lower requests_per_minute / tokens_per_minute in SCHEDULER_SETTINGS or retry later.")
+        raise typer.Exit(1)
     except Exception as e:
         # Clean any sensitive data from error message
         error_msg = SafeFormatter.clean_sensitive_data(str(e))
         console.print(f"[bold red]Error:[/] {error_msg}")
         raise typer.Exit(1)
 
+@app.command()
+def serve(
+    host: str = typer.Option(SERVER_SETTINGS["host"], help="Address to bind the job API to"),
+    port: int = typer.Option(SERVER_SETTINGS["port"], help="Port for the job API"),
+    workers: int = typer.Option(SERVER_SETTINGS["workers"], help="Number of jobs run concurrently"),
+    github_token: Optional[str] = typer.Option(
+        None,
+        help="GitHub token. If not provided, will use GITHUB_TOKEN from settings or environment"
+    )
+) -> None:
+    """Keep agencies warm and run documentation jobs submitted over a local HTTP API"""
+    Path(FILES_DIR).mkdir(parents=True, exist_ok=True)
+    token = check_credentials(github_token)
+    # The agents read the token from the environment
+    os.environ["GITHUB_TOKEN"] = token
+
+    console.print(f"[bold blue]Serving documentation jobs on http://{host}:{port} with {workers} worker(s)...[/]")
+    serve_jobs(host, port, workers, clean=SafeFormatter.clean_sensitive_data)
+
 if __name__ == "__main__":
     app()
\ No newline at end of file